@@ -0,0 +1,167 @@
+import argparse
+import datetime
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+class StubWidget:
+    def __init__(self, master=None, **kw):
+        self.master, self.options, self.children = master, dict(kw), []
+        if master is not None: master.children.append(self)
+    def configure(self, **kw): self.options.update(kw)
+    config = configure
+    def cget(self, key): return self.options.get(key)
+    def pack(self, **kw): pass
+    def pack_forget(self): pass
+    def pack_configure(self, **kw): pass
+    def pack_propagate(self, flag): pass
+    def place(self, **kw): pass
+    def bind(self, event, func=None, add=None): pass
+    def unbind(self, event): pass
+    def winfo_children(self): return list(self.children)
+    def winfo_x(self): return 200
+    def winfo_y(self): return 200
+    def winfo_width(self): return 960
+    def winfo_height(self): return 600
+    def destroy(self):
+        if self.master is not None and self in self.master.children: self.master.children.remove(self)
+    def get(self): return "0"
+    def update(self): pass
+
+class StubCanvas(StubWidget):
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self.items, self.ids = {}, itertools.count(1)
+    def create(self, coords, kw):
+        item = next(self.ids)
+        tags = kw.get("tags", ())
+        self.items[item] = dict(kw, coords=coords, tags=(tags,) if isinstance(tags, str) else tuple(tags))
+        return item
+    def create_text(self, *coords, **kw): return self.create(coords, kw)
+    def create_line(self, *coords, **kw): return self.create(coords, kw)
+    def create_oval(self, *coords, **kw): return self.create(coords, kw)
+    def find(self, tag):
+        if isinstance(tag, int): return [tag] if tag in self.items else []
+        return list(self.items) if tag == "all" else [i for i, item in self.items.items() if tag in item["tags"]]
+    def itemconfig(self, tag, **kw):
+        for i in self.find(tag): self.items[i].update(kw)
+    itemconfigure = itemconfig
+    def coords(self, tag, *coords):
+        for i in self.find(tag): self.items[i]["coords"] = coords
+    def delete(self, tag):
+        for i in self.find(tag): del self.items[i]
+
+class StubTk(StubWidget):
+    def __init__(self, *args, **kw):
+        super().__init__()
+        self.pending, self.ids = {}, itertools.count(1)
+    def after(self, ms, func=None, *args):
+        after_id = f"after#{next(self.ids)}"
+        self.pending[after_id] = (func, args)
+        return after_id
+    def after_cancel(self, after_id): self.pending.pop(after_id, None)
+    def overrideredirect(self, flag=None): pass
+    def geometry(self, spec=None): pass
+    def attributes(self, *args): pass
+    def iconify(self): pass
+    def state(self): return "normal"
+    def mainloop(self): pass
+
+class StubFont:
+    def __init__(self, **kw): self.options = kw
+    def configure(self, **kw): self.options.update(kw)
+
+def install_stub_tk():
+    tk = types.ModuleType("tkinter")
+    tk.Tk, tk.Frame, tk.Label, tk.Button, tk.Canvas, tk.TclError = StubTk, StubWidget, StubWidget, StubWidget, StubCanvas, RuntimeError
+    tk.ttk = types.ModuleType("tkinter.ttk")
+    tk.ttk.Spinbox = StubWidget
+    tk.font = types.ModuleType("tkinter.font")
+    tk.font.Font = StubFont
+    sys.modules.update({"tkinter": tk, "tkinter.ttk": tk.ttk, "tkinter.font": tk.font})
+
+def per_call_us(func, number):
+    runs = timeit.repeat(func, number=number, repeat=5)
+    return {"best_us": min(runs) / number * 1e6, "median_us": statistics.median(runs) / number * 1e6}
+
+def bench_startup(stub, runs=5):
+    cmd = [sys.executable, os.path.abspath(__file__), "--startup-child"] + (["--stub"] if stub else [])
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(runs): times.append(float(subprocess.check_output(cmd, cwd=tmp, text=True).split()[-1]))
+    return {"best_ms": min(times) * 1000, "median_ms": statistics.median(times) * 1000}
+
+def startup_child():
+    t0 = time.perf_counter()
+    sys.path.insert(0, HERE)
+    import clock
+    app = clock.StudioClock()
+    app.update()
+    print(time.perf_counter() - t0)
+    app.destroy()
+
+def bench_app(number):
+    import clock
+    from wordclock import THEMES
+    app = clock.StudioClock()
+    results = {}
+    base = datetime.datetime(2026, 1, 1, 9, 0, 0)
+    seconds = itertools.cycle([base + datetime.timedelta(seconds=s) for s in range(60)])
+    results["tick (same slot)"] = per_call_us(lambda: app.tick(next(seconds)), number)
+    slots = itertools.cycle([base, base + datetime.timedelta(minutes=5)])
+    results["tick (slot change)"] = per_call_us(lambda: app.tick(next(slots)), number)
+    names = list(THEMES)
+    keys = ["bg", "grid_dim", "ui_dim", "lit", "accent", "sec"]
+    pairs = itertools.cycle([({k: THEMES[a][k] for k in keys}, {k: THEMES[b][k] for k in keys}) for a, b in zip(names, names[1:] + names[:1])])
+    progress = itertools.cycle([i / 6 for i in range(7)])
+    def theme_frame():
+        old_t, new_t = next(pairs)
+        app.apply_visuals(clock.interp_value(old_t, new_t, next(progress)))
+    results["animate_theme_transition frame"] = per_call_us(theme_frame, number)
+    results["toggle_mini"] = per_call_us(app.toggle_mini, max(1, number // 20))
+    results["draw_grid"] = per_call_us(app.draw_grid, max(1, number // 20))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = clock.ConfigStore(app, os.path.join(tmp, "config.json"))
+        counter = itertools.count()
+        def save():
+            store.data = {"theme": "Neon", "x": next(counter)}
+            store.flush()
+        results["config flush (atomic write)"] = per_call_us(save, max(1, number // 20))
+        results["config update (debounced)"] = per_call_us(lambda: store.update({"theme": "Neon", "x": next(counter)}), number)
+        store.flush()
+    app.destroy()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the word clock hot paths.")
+    parser.add_argument("--stub", action="store_true", help="use a stubbed Tk instead of a display (e.g. Xvfb)")
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing run")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--startup-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    stub = args.stub or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY"))
+    if stub: install_stub_tk()
+    if args.startup_child: return startup_child()
+    results = {"startup to first tick": bench_startup(stub)}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try: results.update(bench_app(args.number))
+        finally: os.chdir(cwd)
+    if args.json: return print(json.dumps({"tk": "stub" if stub else "display", "results": results}, indent=2))
+    print(f"Tk: {'stub' if stub else os.environ.get('DISPLAY', 'native')}")
+    for name, r in results.items():
+        best, median, unit = (r["best_ms"], r["median_ms"], "ms") if "best_ms" in r else (r["best_us"], r["median_us"], "us")
+        print(f"{name:32} best {best:10.2f} {unit}   median {median:10.2f} {unit}")
+
+if __name__ == "__main__":
+    main()
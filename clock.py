@@ -1,80 +1,306 @@
 import tkinter as tk
 from tkinter import ttk
+from tkinter import font as tkfont
 import math
 import datetime
+import functools
 import json
 import os
+import sys
+import tempfile
+import time
+from instrument import Profiler
+from simulate import Recorder, sim_settings
+from wordclock import (THEMES, DAYS_VN, BASE_GLYPHS, BLANK_SLOT, SLOTS, TRANSITIONS, CLOCK_SOURCES, WallClock, SimulatedClock, ZoneClock,
+                       NORM_SIZE, MINI_SIZE, GRID_CANVAS, ANALOG_SIZE, HANDS, hand_table, grid_layout, slot_of, slot_delay_ms, minute_delay_ms, cells, greeting_for)
+
+RAMP_STEPS = 32
+# Applied when "low_power" in config.json has "enabled": true; the other keys can be overridden there.
+LOW_POWER_DEFAULTS = {"enabled": False, "fades": False, "seconds_hand": False}
+
+@functools.lru_cache(maxsize=256)
+def hex_to_rgb(hex_val): return tuple(int(hex_val.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+def rgb_to_hex(rgb): return "#%02x%02x%02x" % rgb
+
+@functools.lru_cache(maxsize=1024)
+def color_ramp(c1, c2):
+    (r1, g1, b1), (r2, g2, b2) = hex_to_rgb(c1), hex_to_rgb(c2)
+    return tuple(rgb_to_hex((int(r1+(r2-r1)*t), int(g1+(g2-g1)*t), int(b1+(b2-b1)*t))) for t in (i / RAMP_STEPS for i in range(RAMP_STEPS + 1)))
+
+@functools.lru_cache(maxsize=64)
+def theme_ramp(a, b):
+    b = dict(b)
+    ramps = [(k, color_ramp(c, b[k])) for k, c in a]
+    return tuple({k: ramp[i] for k, ramp in ramps} for i in range(RAMP_STEPS + 1))
+
+def interp_color(c1, c2, t): return color_ramp(c1, c2)[int(t * RAMP_STEPS + 0.5)]
+
+def interp_value(a, b, t):
+    if isinstance(a, dict): return theme_ramp(tuple(a.items()), tuple(b.items()))[int(t * RAMP_STEPS + 0.5)]
+    return interp_color(a, b, t)
+
+class Animator:
+    FRAME_MS = 15
+
+    def __init__(self, widget):
+        self.widget, self.tweens, self.after_id = widget, {}, None
+        self.enabled, self.jumps = True, {}
+
+    def animate(self, target, prop, start, end, duration, delay=0, done=None):
+        if not self.enabled: return self.jump(target, prop, end, delay, done)
+        key, now = (target, prop), time.monotonic()
+        if key in self.tweens: start = self.value(self.tweens[key], now)
+        self.tweens[key] = (start, end, now + delay / 1000, duration / 1000, done)
+        if not delay: self.apply(target, {prop: start})
+        if not self.after_id: self.after_id = self.widget.after(self.FRAME_MS, self.frame)
+
+    def jump(self, target, prop, end, delay, done):
+        self.cancel(target, prop)
+        def finish():
+            self.jumps.pop((target, prop), None)
+            self.apply(target, {prop: end})
+            if done: done()
+        if delay: self.jumps[target, prop] = self.widget.after(delay, finish)
+        else: finish()
+
+    def cancel(self, target, prop=None):
+        for key in [k for k in self.tweens if k[0] == target and prop in (None, k[1])]: del self.tweens[key]
+        for key in [k for k in self.jumps if k[0] == target and prop in (None, k[1])]: self.widget.after_cancel(self.jumps.pop(key))
+
+    def value(self, tween, now):
+        start, end, t0, duration, _ = tween
+        return interp_value(start, end, min(1, max(0, (now - t0) / duration)) if duration else 1)
+
+    def apply(self, target, props):
+        if isinstance(target, tuple): target[0].itemconfig(target[1], **props)
+        elif hasattr(target, "configure"): target.configure(**props)
+        else: target(**props)
+
+    def frame(self):
+        now, batch, finished = time.monotonic(), {}, []
+        for key, tween in self.tweens.items():
+            if now < tween[2]: continue
+            ended = now >= tween[2] + tween[3]
+            if ended: finished.append(key)
+            batch.setdefault(key[0], {})[key[1]] = tween[1] if ended else self.value(tween, now)
+        for target, props in batch.items(): self.apply(target, props)
+        for key in finished:
+            done = self.tweens.pop(key)[4]
+            if done: done()
+        self.after_id = self.widget.after(self.FRAME_MS, self.frame) if self.tweens else None
+
+class TickScheduler:
+    JUMP_TOLERANCE = 2.0
+
+    def __init__(self, widget, source, callback, throttle=None):
+        self.widget, self.source, self.callback, self.throttle = widget, source, callback, throttle
+        self.after_id, self.mark = None, None
+
+    def start(self, source=None):
+        if source is not None: self.source = source
+        self.stop()
+        self.mark = None
+        self.run()
+
+    def stop(self):
+        if self.after_id: self.widget.after_cancel(self.after_id)
+        self.after_id = None
+
+    def run(self):
+        wall, mono = time.time(), time.monotonic()
+        jumped = self.mark is None or abs((wall - self.mark[0]) - (mono - self.mark[1])) > self.JUMP_TOLERANCE
+        if jumped: self.source.resync()
+        self.mark = (wall, mono)
+        self.callback(self.source.now(), jumped)
+        now = self.source.now()
+        delay = self.throttle(now) if self.throttle else None
+        self.after_id = self.widget.after(delay or self.source.delay_ms(now), self.run)
+
+class ConfigStore:
+    QUIET_MS = 1500
+
+    def __init__(self, widget, path="config.json"):
+        self.widget, self.path = widget, path
+        self.data, self.written, self.after_id = None, None, None
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict): self.data, self.written = data, dict(data)
+            except (OSError, ValueError): pass
+        return self.data
+
+    def update(self, data):
+        if data == self.data: return
+        self.data = data
+        if self.after_id: self.widget.after_cancel(self.after_id)
+        self.after_id = self.widget.after(self.QUIET_MS, self.flush)
+
+    def flush(self):
+        if self.after_id: self.widget.after_cancel(self.after_id)
+        self.after_id = None
+        if self.data is None or self.data == self.written: return
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), prefix=".config-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except OSError:
+            if tmp and os.path.exists(tmp): os.remove(tmp)
+            return
+        self.written = dict(self.data)
+
+class ClockFace:
+    single_item = False
+    sweep_after_id = None
+    server = None
+    recorder = None
+    suspended = False
+    seconds_hand = True
+
+    def grid_font(self):
+        if self.is_mini not in self.grid_fonts:
+            size, _ = grid_layout(self.is_mini)
+            self.grid_fonts[self.is_mini] = tkfont.Font(family="Courier New", size=size, weight="bold")
+        return self.grid_fonts[self.is_mini]
+
+    def build_grid(self):
+        font = self.grid_font()
+        for i, char in enumerate(BASE_GLYPHS):
+            if self.single_item:
+                lid = self.word_canvas.create_text(0, 0, text=char, fill=self.t["grid_dim"], font=font, tags=("grid", "grid_dim"))
+                self.grid_items.append((lid,))
+            else:
+                dim = self.word_canvas.create_text(0, 0, text=char, fill=self.t["grid_dim"], font=font, tags=("grid", "grid_dim"))
+                lid = self.word_canvas.create_text(0, 0, text=char, fill=self.t["lit"], font=font, state='hidden', tags=("grid", "grid_lit"))
+                self.grid_items.append((dim, lid))
+            self.text_ids[i] = lid
+
+    def draw_grid(self):
+        if not self.grid_items: self.build_grid()
+        self.word_canvas.itemconfig("grid", font=self.grid_font())
+        _, centers = grid_layout(self.is_mini)
+        for items, (x, y) in zip(self.grid_items, centers):
+            for item in items: self.word_canvas.coords(item, x, y)
+
+    def light_on(self, i, glyph):
+        lid = self.text_ids[i]
+        if self.single_item: self.word_canvas.itemconfig(lid, text=glyph, tags=("grid", "grid_lit"))
+        else: self.word_canvas.itemconfig(lid, text=glyph, state='normal')
+        self.animator.animate((self.word_canvas, lid), "fill", self.t["grid_dim"], self.t["lit"], 150)
+
+    def light_change(self, i, glyph):
+        lid = self.text_ids[i]
+        self.animator.cancel((self.word_canvas, lid))
+        if self.single_item: self.word_canvas.itemconfig(lid, text=glyph, fill=self.t["lit"])
+        else: self.word_canvas.itemconfig(lid, text=glyph, state='normal', fill=self.t["lit"])
+
+    def light_off(self, i):
+        lid = self.text_ids[i]
+        if self.single_item:
+            self.word_canvas.itemconfig(lid, tags=("grid", "grid_dim"))
+            done = lambda: self.word_canvas.itemconfig(lid, text=BASE_GLYPHS[i])
+        else: done = lambda: self.word_canvas.itemconfig(lid, state='hidden')
+        self.animator.animate((self.word_canvas, lid), "fill", self.t["lit"], self.t["grid_dim"], 150, done=done)
+
+    def tick(self, now, resync=False, slot=None):
+        h, m, s = now.hour, now.minute, now.second
+        if slot is None: slot = slot_of(h, m)
+        if self.server: self.server.publish_threadsafe(now, self.t)
+        if self.recorder: self.recorder.feed(now, slot)
+        if self.suspended: return
+        greeting = greeting_for(h)
+        if resync or greeting != self.greeting_text:
+            self.greeting.config(text=greeting)
+            self.greeting_text = greeting
+
+        if slot != self.slot_prev:
+            on, off, changed = TRANSITIONS[self.slot_prev][slot]
+            glyphs = SLOTS[slot][1]
+            for i in cells(on): self.light_on(i, glyphs.get(i, BASE_GLYPHS[i]))
+            for i in cells(changed): self.light_change(i, glyphs.get(i, BASE_GLYPHS[i]))
+            for i in cells(off): self.light_off(i)
+            self.slot_prev = slot
+
+        if not self.is_mini:
+            self.move_hand("hour", (h % 12) * 60 + m)
+            self.move_hand("min", m * 60 + s)
+            if self.seconds_hand and not self.sweep_after_id: self.move_hand("sec", s)
+            self.digital_lbl.config(text=now.strftime('%H:%M:%S' if self.seconds_hand else '%H:%M'))
+            self.date_lbl.config(text=f"{DAYS_VN[now.weekday()]}, {now.strftime('%d/%m/%Y')}")
 
-THEMES = {
-    "Tiêu chuẩn": {"bg": "#121212", "grid_dim": "#1f1f1f", "ui_dim": "#333333", "lit": "#ffffff", "accent": "#00d2ff", "sec": "#ff3b30"},
-    "Huyền bí":   {"bg": "#282a36", "grid_dim": "#343746", "ui_dim": "#44475a", "lit": "#f8f8f2", "accent": "#bd93f9", "sec": "#ff79c6"},
-    "Neon":       {"bg": "#0b0c15", "grid_dim": "#151726", "ui_dim": "#22263d", "lit": "#ff2a6d", "accent": "#05d9e8", "sec": "#d1f7ff"},
-    "Rừng xanh":  {"bg": "#021a0c", "grid_dim": "#052612", "ui_dim": "#0a4020", "lit": "#98fb98", "accent": "#00ff7f", "sec": "#ffffff"},
-    "Biển sâu":   {"bg": "#001e26", "grid_dim": "#012d38", "ui_dim": "#034d5e", "lit": "#e0f7fa", "accent": "#00bcd4", "sec": "#ff9800"},
-    "Tối giản":   {"bg": "#000000", "grid_dim": "#1a1a1a", "ui_dim": "#333333", "lit": "#eeeeee", "accent": "#ffffff", "sec": "#ffffff"},
-    "Chiều tà":   {"bg": "#2d1b2e", "grid_dim": "#3d243e", "ui_dim": "#5c3b3e", "lit": "#ffd700", "accent": "#ff6b6b", "sec": "#feca57"},
-    "Anh đào":    {"bg": "#2d142c", "grid_dim": "#3d1d3b", "ui_dim": "#5e2a5a", "lit": "#fff0f5", "accent": "#ff8fab", "sec": "#ffb3c1"},
-    "Sa mạc":     {"bg": "#2b1d0e", "grid_dim": "#3d2b18", "ui_dim": "#5e452a", "lit": "#fef5e7", "accent": "#edae49", "sec": "#d1495b"},
-    "Băng giá":   {"bg": "#0f172a", "grid_dim": "#1e293b", "ui_dim": "#334155", "lit": "#f1f5f9", "accent": "#38bdf8", "sec": "#94a3b8"},
-    "Cổ điển":    {"bg": "#2c2c2c", "grid_dim": "#3d3d3d", "ui_dim": "#4a4a4a", "lit": "#dcdcdc", "accent": "#c5a059", "sec": "#8b0000"},
-}
-
-GRID_CHARS = [
-    ['b', 'â', 'y', 'm', 'g', 'i', 'ờ', 't', 'l', 'à'],
-    ['m', 'ư', 'ờ', 'i', 'b', 'ả', 'y', 'h', 'a', 'i'],
-    ['c', 'h', 'í', 'n', 'ă', 'm', 'ộ', 't', 'á', 'm'],
-    ['s', 'á', 'u', 'b', 'ố', 'n', 'r', 'g', 'i', 'ờ'],
-    ['k', 'é', 'm', 'r', 'ư', 'ỡ', 'i', 'h', 'a', 'i'],
-    ['n', 'ă', 'm', 'ư', 'ờ', 'i', 'í', 'l', 'ă', 'm'],
-]
-
-DAYS_VN = ["Thứ Hai", "Thứ Ba", "Thứ Tư", "Thứ Năm", "Thứ Sáu", "Thứ Bảy", "Chủ Nhật"]
-def get_range(r, c1, c2): return [(r, c) for c in range(c1, c2 + 1)]
-
-WORDS = {
-    "PREFIX":   get_range(0, 0, 2) + get_range(0, 4, 6) + get_range(0, 8, 9),
-    "HOURS_1":  get_range(2, 5, 7), "HOURS_2":  get_range(1, 7, 9),
-    "HOURS_3":  get_range(1, 4, 5), "HOURS_4":  get_range(3, 3, 5),
-    "HOURS_5":  get_range(2, 3, 5), "HOURS_6":  get_range(3, 0, 2),
-    "HOURS_7":  get_range(1, 4, 6), "HOURS_8":  get_range(2, 7, 9),
-    "HOURS_9":  get_range(2, 0, 3), "HOURS_10": get_range(1, 0, 3),
-    "HOURS_11": get_range(1, 0, 3) + get_range(2, 5, 7),
-    "HOURS_12": get_range(1, 0, 3) + get_range(1, 7, 9),
-    "GIO":       get_range(3, 7, 9), "KEM":      get_range(4, 0, 2),
-    "RUOI":     get_range(4, 3, 6), "MIN_5":    get_range(5, 0, 2),
-    "MIN_10":   get_range(5, 2, 5), "MIN_TY":   get_range(5, 2, 5),
-    "MIN_LAM":  get_range(5, 7, 9), "MIN_2":    get_range(4, 7, 9),
-}
-
-MINUTE_PATTERNS = {
-    0: [], 5: ["MIN_5"], 10: ["MIN_10"], 15: ["MIN_10", "MIN_LAM"],
-    20: ["MIN_2", "MIN_TY"], 25: ["MIN_2", "MIN_TY", "MIN_LAM"], 30: ["RUOI"]
-}
-
-OVERRIDES = {"HOURS_3": {(1, 5): "a"}, "MIN_TY": {(5, 4): "ơ"}}
-
-class StudioClock(tk.Tk):
-    NORM_W, NORM_H = 960, 600
-    MINI_W, MINI_H = 450, 350 
+    def build_analog(self):
+        c = ANALOG_SIZE / 2; r = c - 10
+        self.face_ring = self.analog.create_oval(c-r, c-r, c+r, c+r, outline=self.t["ui_dim"], width=2)
+        for i in range(12):
+            a = math.radians(i*30-90)
+            self.analog.create_line(c+(r-2)*math.cos(a), c+(r-2)*math.sin(a), c+(r-12)*math.cos(a), c+(r-12)*math.sin(a), fill=self.t["ui_dim"], width=2, tags="face_tick")
+        self.hand_tables = {}
+        for name, positions, inset, width, color in HANDS:
+            self.hand_tables[name] = hand_table(ANALOG_SIZE, positions, inset)
+            self.hand_ids[name] = self.analog.create_line(c, c, c, c, fill=self.t[color], width=width, capstyle="round")
+        if not self.seconds_hand: self.analog.itemconfig(self.hand_ids["sec"], state="hidden")
+
+    def draw_analog_face(self):
+        self.analog.itemconfig(self.face_ring, outline=self.t["ui_dim"])
+        self.analog.itemconfig("face_tick", fill=self.t["ui_dim"])
+        for name, _, _, _, color in HANDS: self.analog.itemconfig(self.hand_ids[name], fill=self.t[color])
+
+    def move_hand(self, name, pos):
+        if pos == self.hand_pos.get(name): return
+        self.hand_pos[name] = pos
+        table = self.hand_tables[name]
+        i, f = int(pos), pos - int(pos)
+        (x0, y0), (x1, y1) = table[i % len(table)], table[(i + 1) % len(table)]
+        c = ANALOG_SIZE / 2
+        self.analog.coords(self.hand_ids[name], c, c, x0 + (x1 - x0) * f, y0 + (y1 - y0) * f)
+
+class StudioClock(ClockFace, tk.Tk):
+    NORM_W, NORM_H = NORM_SIZE
+    MINI_W, MINI_H = MINI_SIZE
     TOOLBAR_H = 35
 
     def __init__(self):
+        self.profile_path = os.environ.get("CLOCK_PROFILE")
+        self.profiler = Profiler() if self.profile_path else None
         super().__init__()
         self.overrideredirect(True)
+        self.config_store = ConfigStore(self)
         conf = self.load_config()
         self.theme_name = conf.get("theme", "Tiêu chuẩn")
         self.is_mini = conf.get("is_mini", False)
         self.offset_seconds = conf.get("offset_seconds", 0)
+        self.clock_source = conf.get("clock_source", "wall")
         pos_x = conf.get("x", 200)
         pos_y = conf.get("y", 200)
         cur_w, cur_h = (self.MINI_W, self.MINI_H) if self.is_mini else (self.NORM_W, self.NORM_H)
         self.geometry(f"{cur_w}x{cur_h}+{pos_x}+{pos_y}")
         self.t = THEMES.get(self.theme_name, THEMES["Tiêu chuẩn"]).copy()
         self.show_settings = False
-        self.test_mode, self.test_val = False, 0
-        self.active_chars_prev = {}
-        self.toast_after_id = None 
-        self.text_ids = {}
+        self.test_mode = False
+        try: self.simulation = sim_settings(conf.get("simulation"))
+        except ValueError as e:
+            print(f"config.json simulation: {e}, using the defaults", file=sys.stderr)
+            self.simulation = sim_settings()
+        self.greeting_text = None
+        self.slot_prev = BLANK_SLOT
+        self.animator = Animator(self)
+        power = conf.get("low_power", {})
+        if not isinstance(power, dict):
+            print(f"config.json low_power: expected an object, got {power!r}, using the defaults", file=sys.stderr)
+            power = {}
+        power = {**LOW_POWER_DEFAULTS, **power}
+        if power["enabled"]: self.animator.enabled, self.seconds_hand = power["fades"], power["seconds_hand"]
+        self.text_ids, self.grid_items, self.grid_fonts = {}, [], {}
+        self.single_item = conf.get("grid_single_item", False)
+        self.hand_ids, self.hand_pos = {}, {}
+        self.sweep_fps = conf.get("sweep_fps", 0)
+        self.sweep_after_id = None
         self.configure(bg=self.t["bg"])
         self.attributes("-topmost", True)
         self.content_frame = tk.Frame(self, bg=self.t["bg"])
@@ -86,12 +312,12 @@ class StudioClock(tk.Tk):
         self.main_container.pack(side="top", expand=True, fill="both", padx=40)
         self.toast_lbl = tk.Label(self.content_frame, text="", bg=self.t["bg"], font=("Courier New", 14, "bold"), anchor="w")
         self.toast_lbl.place(x=20, y=15, anchor="nw")
-        self.word_canvas = tk.Canvas(self.main_container, width=540, height=360, bg=self.t["bg"], highlightthickness=0)
+        self.word_canvas = tk.Canvas(self.main_container, width=GRID_CANVAS[0], height=GRID_CANVAS[1], bg=self.t["bg"], highlightthickness=0)
         self.word_canvas.pack(side="left")
         self.right_stack = tk.Frame(self.main_container, bg=self.t["bg"], width=280)
         self.right_stack.pack(side="left", fill="y", padx=(50, 0))
         self.right_stack.pack_propagate(False)
-        self.analog = tk.Canvas(self.right_stack, width=240, height=240, bg=self.t["bg"], highlightthickness=0)
+        self.analog = tk.Canvas(self.right_stack, width=ANALOG_SIZE, height=ANALOG_SIZE, bg=self.t["bg"], highlightthickness=0)
         self.analog.pack(side="top", pady=(80, 0))
         self.digital_lbl = tk.Label(self.right_stack, text="", fg=self.t["accent"], bg=self.t["bg"], font=("Courier New", 18, "bold"))
         self.digital_lbl.pack(side="bottom", pady=(0, 80))
@@ -109,31 +335,75 @@ class StudioClock(tk.Tk):
         self.setup_icons()
         self.setup_toolbar() 
         self.draw_grid()
-        self.draw_analog_face()
+        self.build_analog()
 
         self.bind("<Button-1>", self.on_click)
         self.bind("<B1-Motion>", self.on_drag)
         self.bind("<Map>", self.on_restore)
-        self.tick()
+        self.bind("<Unmap>", self.on_hide)
+        if self.profiler: self.bind("<F12>", lambda e: self.dump_profile(sys.stderr))
+        if os.environ.get("CLOCK_SERVER"): self.start_server(os.environ["CLOCK_SERVER"])
+        self.scheduler = TickScheduler(self, self.make_source(), self.tick, self.wake_delay)
+        self.scheduler.start()
+        self.start_sweep()
 
     def load_config(self):
-        if os.path.exists("config.json"):
-            try:
-                with open("config.json", "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except: pass
-        return {"theme": "Tiêu chuẩn", "is_mini": False, "x": 200, "y": 200, "offset_seconds": 0}
+        return self.config_store.load() or {"theme": "Tiêu chuẩn", "is_mini": False, "x": 200, "y": 200, "offset_seconds": 0, "clock_source": "wall"}
 
     def save_config(self):
         data = {
+            **(self.config_store.data or {}),
             "theme": self.theme_name,
             "is_mini": self.is_mini,
             "x": self.winfo_x(),
             "y": self.winfo_y(),
-            "offset_seconds": self.offset_seconds
+            "offset_seconds": self.offset_seconds,
+            "clock_source": self.clock_source,
+            "sweep_fps": self.sweep_fps,
+            "grid_single_item": self.single_item
         }
-        with open("config.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        self.config_store.update(data)
+
+    def destroy(self):
+        self.save_config()
+        self.config_store.flush()
+        try:
+            if self.server: self.server.stop()
+        except Exception as e: print(f"state server: {e!r}", file=sys.stderr)
+        try:
+            if self.recorder: self.recorder.close()
+        except OSError as e: print(f"simulation record: {e}", file=sys.stderr)
+        try:
+            if self.profiler and self.profile_path != "1":
+                with open(self.profile_path, "w", encoding="utf-8") as f: self.dump_profile(f)
+        except OSError as e: print(f"CLOCK_PROFILE {self.profile_path}: {e}", file=sys.stderr)
+        super().destroy()
+
+    def start_server(self, spec):
+        from server import StateServer, parse_address
+        try:
+            server = StateServer(parse_address(spec))
+            server.start_thread()
+        except (OSError, ValueError) as e: return print(f"state server {spec}: {e}", file=sys.stderr)
+        self.server = server
+
+    def after(self, ms, func=None, *args):
+        if self.profiler is None or func is None: return super().after(ms, func, *args)
+        name = getattr(func, "__qualname__", type(func).__name__)
+        def fire(*a):
+            self.profiler.pending.discard(after_id)
+            self.profiler.timed(name, func, *a)
+        after_id = super().after(ms, fire, *args)
+        self.profiler.pending.add(after_id)
+        return after_id
+
+    def after_cancel(self, after_id):
+        if self.profiler: self.profiler.pending.discard(after_id)
+        super().after_cancel(after_id)
+
+    def dump_profile(self, f):
+        f.write(self.profiler.report() + "\n")
+        f.flush()
 
     def on_click(self, event): self.dx, self.dy = event.x, event.y
     def on_drag(self, event): 
@@ -147,20 +417,41 @@ class StudioClock(tk.Tk):
 
     def on_restore(self, event):
         if self.state() == "normal": self.overrideredirect(True)
+        if event.widget is self: self.set_suspended(False)
+
+    def on_hide(self, event):
+        if event.widget is self: self.set_suspended(True)
+
+    def set_suspended(self, hidden):
+        if hidden == self.suspended: return
+        self.suspended = hidden
+        if not hidden: self.scheduler.start()
+        elif not (self.server or self.recorder): self.scheduler.stop()
+        self.start_sweep()
+
+    def wake_delay(self, now):
+        if self.test_mode or self.server: return None
+        if self.is_mini: return slot_delay_ms(now)
+        if not self.seconds_hand: return minute_delay_ms(now)
 
-    def bind_hover(self, btn, normal_bg, hover_bg, normal_fg, hover_fg):
-        btn.bind("<Enter>", lambda e: btn.config(bg=hover_bg, fg=hover_fg))
-        btn.bind("<Leave>", lambda e: btn.config(bg=normal_bg, fg=normal_fg))
+    def hover_colors(self, theme, active, inside):
+        if active: return {"bg": theme["lit"] if inside else theme["accent"], "fg": theme["bg"]}
+        return {"bg": theme["ui_dim"], "fg": theme["accent"]} if inside else {"bg": theme["bg"], "fg": theme["lit"]}
+
+    def bind_hover(self, btn, active=lambda: False):
+        btn.bind("<Enter>", lambda e: btn.config(**self.hover_colors(self.t, active(), True)))
+        btn.bind("<Leave>", lambda e: btn.config(**self.hover_colors(self.t, active(), False)))
 
     def setup_icons(self):
         for w in self.icon_bar.winfo_children(): w.destroy()
         opt = {"bg": self.t["bg"], "fg": self.t["lit"], "bd": 0, "activebackground": self.t["accent"], "activeforeground": self.t["bg"], "width": 3}
         b1 = tk.Button(self.icon_bar, text="—", font=("Arial", 11, "bold"), command=self.minimize_window, **opt)
         b1.pack(side="left", padx=1)
-        self.bind_hover(b1, self.t["bg"], self.t["ui_dim"], self.t["lit"], self.t["accent"])
+        self.bind_hover(b1)
         b2 = tk.Button(self.icon_bar, text="⚙", font=("Arial", 11), command=self.toggle_toolbar, **opt)
         b2.pack(side="left", padx=1)
-        self.bind_hover(b2, self.t["bg"], self.t["ui_dim"], self.t["lit"], self.t["accent"])
+        self.bind_hover(b2)
+        self.icon_btns = [b1, b2]
 
     def setup_toolbar(self):
         for w in self.toolbar.winfo_children(): w.destroy()
@@ -192,7 +483,10 @@ class StudioClock(tk.Tk):
         
         self.close_btn = tk.Button(self.toolbar, text="✕", command=self.destroy, bg="#822", fg="white", bd=0, padx=10, activebackground="#f44")
         self.close_btn.pack(side="left", expand=True, fill="both")
-        self.apply_visuals(self.t)
+        for btn in [self.theme_btn, self.set_btn, self.reset_btn]: self.bind_hover(btn)
+        self.bind_hover(self.mini_btn, lambda: self.is_mini)
+        self.bind_hover(self.test_btn, lambda: self.test_mode)
+        self.apply_toolbar_colors(self.t)
 
     def cycle_theme(self):
         keys = list(THEMES.keys())
@@ -204,68 +498,46 @@ class StudioClock(tk.Tk):
         self.animate_theme_transition(old_t, new_theme)
         self.t = new_theme
 
-    def animate_theme_transition(self, old_t, new_t, step=0):
-        if step > 5: 
-            self.draw_analog_face()
-            return 
-        progress = step / 5
-        temp = {k: self.interp_color(old_t[k], new_t[k], progress) for k in ["bg", "grid_dim", "ui_dim", "lit", "accent", "sec"]}
-        self.apply_visuals(temp)
-        self.after(15, lambda: self.animate_theme_transition(old_t, new_t, step+1))
+    def animate_theme_transition(self, old_t, new_t):
+        keys = ["bg", "grid_dim", "ui_dim", "lit", "accent", "sec"]
+        self.animator.animate(self.apply_visuals, "theme", {k: old_t[k] for k in keys}, {k: new_t[k] for k in keys}, 90, done=self.draw_analog_face)
 
     def apply_visuals(self, theme):
-        self.configure(bg=theme["bg"])
-        for w in [self.greeting, self.content_frame, self.main_container, self.word_canvas, self.right_stack, self.analog, self.date_lbl, self.digital_lbl, self.icon_bar, self.toast_lbl, self.time_grp]:
-            w.config(bg=theme["bg"])
-        self.greeting.config(fg=theme["accent"])
-        self.digital_lbl.config(fg=theme["accent"])
-        self.date_lbl.config(fg=theme["lit"])
-        self.toolbar.config(bg=theme["ui_dim"])
+        bg, lit, accent = theme["bg"], theme["lit"], theme["accent"]
+        self.configure(bg=bg)
+        for w in [self.content_frame, self.main_container, self.word_canvas, self.right_stack, self.analog, self.icon_bar, self.toast_lbl]:
+            w.config(bg=bg)
+        self.greeting.config(bg=bg, fg=accent)
+        self.digital_lbl.config(bg=bg, fg=accent)
+        self.date_lbl.config(bg=bg, fg=lit)
         self.word_canvas.itemconfig("grid_dim", fill=theme["grid_dim"])
-        self.word_canvas.itemconfig("grid_lit", fill=theme["lit"])
-        self.gio_lbl.config(bg=theme["bg"], fg=theme["lit"])
-        for btn in [self.theme_btn, self.set_btn, self.reset_btn]:
-            btn.config(bg=theme["bg"], fg=theme["lit"], activebackground=theme["accent"])
-            self.bind_hover(btn, theme["bg"], theme["ui_dim"], theme["lit"], theme["accent"])
-        for btn in self.icon_bar.winfo_children():
-            btn.config(bg=theme["bg"], fg=theme["lit"], activebackground=theme["accent"])
-            self.bind_hover(btn, theme["bg"], theme["ui_dim"], theme["lit"], theme["accent"])
-        m_bg, m_fg = (theme["accent"], theme["bg"]) if self.is_mini else (theme["bg"], theme["lit"])
-        self.mini_btn.config(bg=m_bg, fg=m_fg, activebackground=theme["accent"])
-        m_h_bg = theme["lit"] if self.is_mini else theme["ui_dim"]
-        self.bind_hover(self.mini_btn, m_bg, m_h_bg, m_fg, theme["accent"] if not self.is_mini else theme["bg"])
-        t_bg, t_fg = (theme["accent"], theme["bg"]) if self.test_mode else (theme["bg"], theme["lit"])
-        self.test_btn.config(bg=t_bg, fg=t_fg, activebackground=theme["accent"])
-        t_h_bg = theme["lit"] if self.test_mode else theme["ui_dim"]
-        self.bind_hover(self.test_btn, t_bg, t_h_bg, t_fg, theme["accent"] if not self.test_mode else theme["bg"])
+        self.word_canvas.itemconfig("grid_lit", fill=lit)
+        for btn in self.icon_btns: btn.config(bg=bg, fg=lit, activebackground=accent)
+        if self.show_settings: self.apply_toolbar_colors(theme)
+
+    def apply_toolbar_colors(self, theme):
+        bg, lit, accent = theme["bg"], theme["lit"], theme["accent"]
+        self.toolbar.config(bg=theme["ui_dim"])
+        self.time_grp.config(bg=bg)
+        self.gio_lbl.config(bg=bg, fg=lit)
+        for btn in [self.theme_btn, self.set_btn, self.reset_btn]: btn.config(bg=bg, fg=lit, activebackground=accent)
+        self.mini_btn.config(**self.hover_colors(theme, self.is_mini, False), activebackground=accent)
+        self.test_btn.config(**self.hover_colors(theme, self.test_mode, False), activebackground=accent)
 
     def show_theme_toast(self, name, new_t):
         if self.is_mini: return
-        if self.toast_after_id: self.after_cancel(self.toast_after_id)
+        self.animator.cancel(self.toast_lbl)
         self.toast_lbl.config(text=name.upper(), bg=new_t["bg"], fg=new_t["lit"])
         self.toast_lbl.place(x=20, y=15)
-        self.toast_after_id = self.after(500, lambda: self.fade_toast(0, new_t))
-
-    def fade_toast(self, step, theme_at_start):
-        if step > 10: 
-            self.toast_lbl.config(text="") 
-            self.toast_after_id = None
-            return
-        color = self.interp_color(theme_at_start["lit"], theme_at_start["bg"], step/10)
-        self.toast_lbl.config(fg=color)
-        self.toast_after_id = self.after(30, lambda: self.fade_toast(step+1, theme_at_start))
-
-    def hex_to_rgb(self, hex_val): return tuple(int(hex_val.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
-    def rgb_to_hex(self, rgb): return "#%02x%02x%02x" % rgb
-    def interp_color(self, c1, c2, t):
-        r1, g1, b1 = self.hex_to_rgb(c1); r2, g2, b2 = self.hex_to_rgb(c2)
-        return self.rgb_to_hex((int(r1+(r2-r1)*t), int(g1+(g2-g1)*t), int(b1+(b2-b1)*t)))
+        self.animator.animate(self.toast_lbl, "fg", new_t["lit"], new_t["bg"], 300, delay=500, done=lambda: self.toast_lbl.config(text=""))
 
     def toggle_toolbar(self):
         self.show_settings = not self.show_settings
         adj = self.TOOLBAR_H if self.show_settings else -self.TOOLBAR_H
         self.geometry(f"{self.winfo_width()}x{self.winfo_height() + adj}")
-        if self.show_settings: self.toolbar.pack(side="bottom", fill="x")
+        if self.show_settings:
+            self.apply_toolbar_colors(self.t)
+            self.toolbar.pack(side="bottom", fill="x")
         else: self.toolbar.pack_forget()
 
     def toggle_mini(self):
@@ -284,85 +556,34 @@ class StudioClock(tk.Tk):
             self.geometry(f"{self.NORM_W}x{self.NORM_H}")
         self.draw_grid()
         self.setup_toolbar() 
-        self.active_chars_prev.clear()
+        self.scheduler.start()
+        self.start_sweep()
         self.save_config()
 
-    def draw_grid(self):
-        self.word_canvas.delete("all")
-        size, cw, ch = (18, 40, 45) if self.is_mini else (26, 54, 60)
-        off_x = (self.MINI_W - (10 * cw)) // 2 if self.is_mini else 0
-        off_y = 50 if self.is_mini else 0
-        for r in range(6):
-            for c in range(10):
-                char = GRID_CHARS[r][c].upper()
-                x, y = off_x + (c * cw) + (cw // 2), off_y + (r * ch) + (ch // 2)
-                self.word_canvas.create_text(x, y, text=char, fill=self.t["grid_dim"], font=("Courier New", size, "bold"), tags="grid_dim")
-                lid = self.word_canvas.create_text(x, y, text=char, fill=self.t["lit"], font=("Courier New", size, "bold"), state='hidden', tags="grid_lit")
-                self.text_ids[(r,c)] = lid
-
-    def fade_transition(self, tag_id, start_color, end_color, step=0):
-        if step > 5: return
-        self.word_canvas.itemconfig(tag_id, fill=self.interp_color(start_color, end_color, step/5))
-        self.after(30, lambda: self.fade_transition(tag_id, start_color, end_color, step+1))
-
-    def tick(self):
-        now = datetime.datetime.now() + datetime.timedelta(seconds=self.offset_seconds)
-        
-        if self.test_mode:
-            self.test_val = (self.test_val + 5) % 1440
-            now = datetime.datetime.combine(datetime.date.today(), datetime.time(0)) + datetime.timedelta(minutes=self.test_val)
-
-        h, m, s = now.hour, now.minute, now.second
-        self.greeting.config(text="CHÀO BUỔI SÁNG." if 5<=h<12 else "CHÀO BUỔI CHIỀU." if 12<=h<18 else "CHÀO BUỔI TỐI.")
-        
-        m_round = 5 * round(m/5)
-        if m_round == 60: m_round = 0; h += 1
-        dh = h % 12 or 12
-        active_keys = ["PREFIX", f"HOURS_{dh}", "GIO"] + MINUTE_PATTERNS[m_round] if m_round <= 30 else \
-                      ["PREFIX", f"HOURS_{(dh%12)+1}", "GIO", "KEM"] + MINUTE_PATTERNS[60-m_round]
-
-        active_coords = {}
-        for k in active_keys:
-            if k in WORDS:
-                ovr = OVERRIDES.get(k, {})
-                for r, c in WORDS[k]: active_coords[(r,c)] = ovr.get((r,c), GRID_CHARS[r][c]).upper()
-
-        curr_set = set(active_coords.keys())
-        prev_set = set(self.active_chars_prev.keys())
-
-        for rc in curr_set:
-            lid = self.text_ids.get(rc)
-            char = active_coords[rc]
-            if rc not in prev_set:
-                self.word_canvas.itemconfig(lid, text=char, state='normal')
-                self.fade_transition(lid, self.t["grid_dim"], self.t["lit"])
-            elif self.active_chars_prev[rc] != char:
-                self.word_canvas.itemconfig(lid, text=char, state='normal', fill=self.t["lit"])
-
-        for rc in prev_set - curr_set:
-            lid = self.text_ids.get(rc)
-            self.fade_transition(lid, self.t["lit"], self.t["grid_dim"])
-            self.after(200, lambda l=lid: self.word_canvas.itemconfig(l, state='hidden'))
-        
-        self.active_chars_prev = active_coords
-        
-        if not self.is_mini:
-            self.analog.delete("h"); cx, cy, r = 120, 120, 110
-            for a, l, c, w in [(s*6, r-10, self.t["sec"], 1), ((m+s/60)*6, r-30, self.t["accent"], 3), (((h%12)+m/60)*30, r-50, self.t["accent"], 4)]:
-                rad = math.radians(a-90); self.analog.create_line(cx, cy, cx+l*math.cos(rad), cy+l*math.sin(rad), fill=c, width=w, tags="h", capstyle="round")
-            self.digital_lbl.config(text=now.strftime('%H:%M:%S'))
-            self.date_lbl.config(text=f"{DAYS_VN[now.weekday()]}, {now.strftime('%d/%m/%Y')}")
-
-        self.after(500 if self.test_mode else 1000, self.tick)
-
-    def draw_analog_face(self):
-        self.analog.delete("face"); cx, cy, r = 120, 120, 110
-        face_color = self.t["ui_dim"]
-        self.analog.create_oval(cx-r, cy-r, cx+r, cy+r, outline=face_color, width=2, tags="face")
-        for i in range(12):
-            a = math.radians(i*30-90)
-            color = self.t["ui_dim"]
-            self.analog.create_line(cx+(r-2)*math.cos(a), cy+(r-2)*math.sin(a), cx+(r-12)*math.cos(a), cy+(r-12)*math.sin(a), fill=color, width=2, tags="face")
+    def make_source(self):
+        sim = self.simulation
+        if self.test_mode: return SimulatedClock(sim["start"], sim["speed"], sim["interval"], sim["step"], sim["stop"])
+        return CLOCK_SOURCES.get(self.clock_source, WallClock)(self.offset_seconds)
+
+    def restart_clock(self):
+        path = self.simulation["record"] if self.test_mode else None
+        try: recorder = Recorder(open(path, "w", encoding="utf-8")) if path else None
+        except OSError as e: return print(f"simulation record {path}: {e}", file=sys.stderr)
+        if self.recorder: self.recorder.close()
+        self.recorder = recorder
+        self.scheduler.start(self.make_source())
+        self.apply_toolbar_colors(self.t)
+        return True
+
+    def start_sweep(self):
+        if self.sweep_after_id: self.after_cancel(self.sweep_after_id)
+        self.sweep_after_id = None
+        if self.sweep_fps > 0 and self.seconds_hand and not (self.is_mini or self.suspended): self.sweep()
+
+    def sweep(self):
+        now = self.scheduler.source.now()
+        self.move_hand("sec", now.second + now.microsecond / 1e6)
+        self.sweep_after_id = self.after(max(1, 1000 // self.sweep_fps), self.sweep)
 
     def set_manual(self): 
         try:
@@ -370,14 +591,17 @@ class StudioClock(tk.Tk):
             m = int(self.m_sp.get() or 0)
             s = int(self.s_sp.get() or 0)
             
+            if self.test_mode:
+                self.scheduler.source.jump(self.scheduler.source.now().replace(hour=h, minute=m, second=s, microsecond=0))
+                return self.scheduler.start()
+
             now = datetime.datetime.now()
             target = now.replace(hour=h, minute=m, second=s, microsecond=0)
             
             self.offset_seconds = (target - now).total_seconds()
             
-            self.test_mode = False
             self.save_config()
-            self.apply_visuals(self.t)
+            self.restart_clock()
         except ValueError:
             pass
 
@@ -385,11 +609,80 @@ class StudioClock(tk.Tk):
         self.offset_seconds = 0
         self.test_mode = False
         self.save_config()
-        self.apply_visuals(self.t)
+        self.restart_clock()
 
     def toggle_test(self): 
         self.test_mode = not self.test_mode
-        self.apply_visuals(self.t)
+        if not self.restart_clock(): self.test_mode = not self.test_mode
+
+class ClockView(ClockFace, tk.Frame):
+    def __init__(self, master, animator, name, section):
+        self.t = THEMES.get(section.get("theme"), THEMES["Tiêu chuẩn"]).copy()
+        super().__init__(master, bg=self.t["bg"])
+        self.animator, self.name = animator, name
+        self.is_mini = section.get("mini", True)
+        self.single_item = section.get("grid_single_item", False)
+        self.slot_prev, self.greeting_text = BLANK_SLOT, None
+        self.text_ids, self.grid_items, self.hand_ids, self.hand_pos, self.grid_fonts = {}, [], {}, {}, {}
+        self.caption = tk.Label(self, text=name.upper(), fg=self.t["accent"], bg=self.t["bg"], font=("Courier New", 14, "bold"))
+        self.caption.pack(side="top", pady=(10, 0))
+        self.greeting = tk.Label(self, text="", fg=self.t["accent"], bg=self.t["bg"], font=("Courier New", 22, "bold"))
+        self.main_container = tk.Frame(self, bg=self.t["bg"])
+        self.word_canvas = tk.Canvas(self.main_container, width=GRID_CANVAS[0], height=GRID_CANVAS[1], bg=self.t["bg"], highlightthickness=0)
+        self.word_canvas.pack(side="left")
+        if not self.is_mini:
+            self.greeting.pack(side="top", pady=(15, 5))
+            self.right_stack = tk.Frame(self.main_container, bg=self.t["bg"], width=280)
+            self.right_stack.pack(side="left", fill="y", padx=(50, 0))
+            self.analog = tk.Canvas(self.right_stack, width=ANALOG_SIZE, height=ANALOG_SIZE, bg=self.t["bg"], highlightthickness=0)
+            self.analog.pack(side="top", pady=(40, 0))
+            self.date_lbl = tk.Label(self.right_stack, text="", fg=self.t["lit"], bg=self.t["bg"], font=("Courier New", 16, "bold"))
+            self.date_lbl.pack(side="top", pady=(15, 0))
+            self.digital_lbl = tk.Label(self.right_stack, text="", fg=self.t["accent"], bg=self.t["bg"], font=("Courier New", 18, "bold"))
+            self.digital_lbl.pack(side="top", pady=(15, 0))
+            self.build_analog()
+        self.main_container.pack(side="top", padx=20, pady=(0, 10))
+        self.draw_grid()
+
+class ClockHost(tk.Tk):
+    DEFAULT_HOST = {"columns": 4, "views": {"Hà Nội": {"tz": "Asia/Ho_Chi_Minh", "theme": "Tiêu chuẩn", "mini": True}}}
+
+    def __init__(self):
+        super().__init__()
+        self.title("Đồng hồ chữ")
+        self.configure(bg="#000000")
+        self.config_store = ConfigStore(self)
+        conf = self.config_store.load() or {}
+        host = conf.get("host") or self.DEFAULT_HOST
+        if "host" not in conf: self.config_store.update({**conf, "host": host})
+        self.animator = Animator(self)
+        self.zones, self.views = {}, []
+        columns = host.get("columns", 4)
+        for n, (name, section) in enumerate(host.get("views", {}).items()):
+            view = ClockView(self, self.animator, name, section)
+            view.grid(row=n // columns, column=n % columns, padx=2, pady=2, sticky="nsew")
+            tz = section.get("tz") or ""
+            if tz not in self.zones:
+                self.zones[tz] = ZoneClock(tz)
+                if self.zones[tz].missing: print(f"unknown time zone {tz!r}, showing local time (on Windows: pip install tzdata)", file=sys.stderr)
+            if self.zones[tz].missing: view.caption.config(text=f"{name.upper()} (giờ máy)")
+            self.views.append((tz, view))
+        self.bind("<Escape>", lambda e: self.destroy())
+        self.scheduler = TickScheduler(self, WallClock(), self.tick)
+        self.scheduler.start()
+
+    def tick(self, now, resync=False):
+        states = {}
+        for tz, view in self.views:
+            if tz not in states:
+                local = self.zones[tz].now()
+                states[tz] = (local, slot_of(local.hour, local.minute))
+            local, slot = states[tz]
+            view.tick(local, resync, slot)
+
+    def destroy(self):
+        self.config_store.flush()
+        super().destroy()
 
 if __name__ == "__main__":
-    StudioClock().mainloop()
\ No newline at end of file
+    (ClockHost() if "--host" in sys.argv else StudioClock()).mainloop()
\ No newline at end of file
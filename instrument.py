@@ -0,0 +1,44 @@
+import bisect
+import time
+
+# Upper bounds in ms of the histogram buckets; the last bucket is open-ended.
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250)
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.calls, self.total, self.worst = 0, 0.0, 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.calls += 1
+        self.total += ms
+        self.worst = max(self.worst, ms)
+
+    def percentile(self, p):
+        rank, seen = p * self.calls, 0
+        for bound, count in zip(BUCKETS_MS + (self.worst,), self.counts):
+            seen += count
+            if seen >= rank: return min(bound, self.worst)
+        return self.worst
+
+class Profiler:
+    def __init__(self):
+        self.hists, self.pending, self.started = {}, set(), time.monotonic()
+
+    def record(self, name, ms):
+        hist = self.hists.get(name)
+        if hist is None: hist = self.hists[name] = Histogram()
+        hist.add(ms)
+
+    def timed(self, name, func, *args):
+        t0 = time.perf_counter()
+        try: return func(*args)
+        finally: self.record(name, (time.perf_counter() - t0) * 1000)
+
+    def report(self):
+        lines = [f"uptime {time.monotonic() - self.started:.0f}s, pending after() callbacks: {len(self.pending)}",
+                 f"{'callback':40} {'calls':>8} {'mean ms':>9} {'p95 ms':>8} {'max ms':>8}  histogram (<= " + " ".join(map(str, BUCKETS_MS)) + " >)"]
+        for name, h in sorted(self.hists.items(), key=lambda kv: -kv[1].total):
+            lines.append(f"{name[:40]:40} {h.calls:8} {h.total / h.calls:9.3f} {h.percentile(0.95):8.2f} {h.worst:8.2f}  {' '.join(map(str, h.counts))}")
+        return "\n".join(lines)
@@ -0,0 +1,187 @@
+import collections
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import unicodedata
+
+COMPILER_VERSION = 2
+SLOT_COUNT = 144
+
+Layout = collections.namedtuple("Layout", "name rows cols grid base slots transitions greetings days")
+
+class LayoutError(ValueError):
+    pass
+
+def cells(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+# TRANSITIONS[a][b] = (cells turning on, cells turning off, lit cells whose glyph changes);
+# a row is computed the first time slot a is left and kept from then on.
+class Transitions:
+    def __init__(self, slots, base):
+        self.slots, self.base, self.rows = slots, base, {}
+
+    def __getitem__(self, a):
+        row = self.rows.get(a)
+        if row is None: row = self.rows[a] = [self.diff(a, b) for b in range(len(self.slots))]
+        return row
+
+    def diff(self, a, b):
+        (ma, ga), (mb, gb) = self.slots[a], self.slots[b]
+        both, changed = ma & mb, 0
+        for i in ga.keys() | gb.keys():
+            if both >> i & 1 and ga.get(i, self.base[i]) != gb.get(i, self.base[i]): changed |= 1 << i
+        return mb & ~ma, ma & ~mb, changed
+
+def slot_words(spec, slot):
+    h, m_round = divmod(slot, 12)
+    m_round *= 5
+    dh = h % 12 or 12
+    if m_round > spec["to_after"]: dh, m_round, extra = (dh % 12) + 1, 60 - m_round, spec["to_words"]
+    else: extra = []
+    minutes = spec["minutes"].get(str(m_round))
+    if minutes is None: raise LayoutError(f"{slot_time(slot)}: no minute pattern for {m_round}")
+    return [w.replace("{hour}", str(dh)) for w in spec["phrase"]] + extra + minutes
+
+def slot_time(slot): return f"{(slot // 12) % 12 or 12:02d}:{slot % 12 * 5:02d}"
+
+def is_int(value): return isinstance(value, int) and not isinstance(value, bool)
+def is_strs(value): return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+def check(ok, message):
+    if not ok: raise LayoutError(message)
+
+def check_shapes(spec):
+    check(isinstance(spec, dict), "layout must be a JSON object")
+    for key in ("name", "grid", "words", "phrase", "minutes", "to_after", "to_words", "greetings", "days"):
+        check(key in spec, f"missing key {key!r}")
+    check(isinstance(spec["name"], str), "name must be a string")
+    check(is_strs(spec["grid"]), "grid must be a list of strings")
+    check(isinstance(spec["words"], dict), "words must be an object")
+    for name, ranges in spec["words"].items():
+        check(isinstance(ranges, list) and all(isinstance(r, list) and len(r) == 3 and all(map(is_int, r)) for r in ranges),
+              f"{name}: ranges must be [row, first column, last column] lists of integers")
+    check(isinstance(spec.get("overrides", {}), dict), "overrides must be an object")
+    for name, glyphs in spec.get("overrides", {}).items():
+        check(isinstance(glyphs, list) and all(isinstance(g, list) and len(g) == 3 and is_int(g[0]) and is_int(g[1]) and isinstance(g[2], str) for g in glyphs),
+              f"{name}: overrides must be [row, column, glyph] lists")
+    check(is_strs(spec["phrase"]), "phrase must be a list of word names")
+    check(isinstance(spec["minutes"], dict) and all(is_strs(v) for v in spec["minutes"].values()), "minutes must map minutes to lists of word names")
+    check(is_int(spec["to_after"]), "to_after must be an integer")
+    check(is_strs(spec["to_words"]), "to_words must be a list of word names")
+    check(isinstance(spec["greetings"], list) and spec["greetings"] and all(isinstance(g, list) and len(g) == 2 and is_int(g[0]) and isinstance(g[1], str) for g in spec["greetings"]),
+          "greetings must be a non-empty list of [end hour, text] pairs")
+    check(is_strs(spec["days"]) and len(spec["days"]) == 7, "days must list 7 weekday names")
+
+def validate(spec):
+    check_shapes(spec)
+    grid = [list(unicodedata.normalize("NFC", row)) for row in spec["grid"]]
+    rows, cols = len(grid), len(grid[0]) if grid else 0
+    if not rows or not cols or any(len(row) != cols for row in grid): raise LayoutError("grid must be a non-empty rectangle")
+    words = {}
+    for name, ranges in spec["words"].items():
+        word = []
+        for r, c1, c2 in ranges:
+            if not (0 <= r < rows and 0 <= c1 <= c2 < cols): raise LayoutError(f"{name}: range {[r, c1, c2]} is outside the {rows}x{cols} grid")
+            word += [(r, c) for c in range(c1, c2 + 1)]
+        words[name] = word
+    overrides = {}
+    for name, glyphs in spec.get("overrides", {}).items():
+        if name not in words: raise LayoutError(f"override for unknown word {name}")
+        for r, c, glyph in glyphs:
+            if (r, c) not in words[name]: raise LayoutError(f"{name}: override cell {(r, c)} is not part of the word")
+            if len(unicodedata.normalize("NFC", glyph)) != 1: raise LayoutError(f"{name}: override {glyph!r} must be a single character")
+            overrides.setdefault(name, {})[r, c] = unicodedata.normalize("NFC", glyph)
+    ends = [end for end, _ in spec["greetings"]]
+    if ends != sorted(ends) or ends[-1] != 24: raise LayoutError("greetings must be sorted by end hour and end at 24")
+    phrases = []
+    for slot in range(SLOT_COUNT):
+        lit = {}
+        for name in slot_words(spec, slot):
+            if name not in words: raise LayoutError(f"{slot_time(slot)}: unknown word {name}")
+            for rc in words[name]:
+                if rc in lit: raise LayoutError(f"{slot_time(slot)}: {lit[rc]} and {name} both light cell {rc}")
+                lit[rc] = name
+        phrases.append(lit)
+    return grid, words, overrides, phrases
+
+def compile_spec(spec):
+    grid, words, overrides, phrases = validate(spec)
+    rows, cols = len(grid), len(grid[0])
+    base = [ch.upper() for row in grid for ch in row]
+    slots = []
+    for lit in phrases:
+        mask, glyphs = 0, {}
+        for (r, c), name in lit.items():
+            mask |= 1 << (r * cols + c)
+            if (r, c) in overrides.get(name, {}): glyphs[r * cols + c] = overrides[name][r, c].upper()
+        slots.append((mask, glyphs))
+    slots.append((0, {}))
+    return Layout(spec["name"], rows, cols, grid, base, slots, Transitions(slots, base), [tuple(g) for g in spec["greetings"]], list(spec["days"]))
+
+def to_cache(layout):
+    data = layout._asdict()
+    del data["transitions"]
+    data["slots"] = [[mask, {str(i): g for i, g in glyphs.items()}] for mask, glyphs in layout.slots]
+    return data
+
+def from_cache(data):
+    slots = [(mask, {int(i): g for i, g in glyphs.items()}) for mask, glyphs in data["slots"]]
+    return Layout(data["name"], data["rows"], data["cols"], data["grid"], data["base"], slots, Transitions(slots, data["base"]),
+                  [tuple(g) for g in data["greetings"]], data["days"])
+
+def user_cache_dir():
+    if sys.platform == "win32": base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin": base = os.path.expanduser("~/Library/Caches")
+    else: base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "vietnamese-word-clock", "layouts")
+
+# Cache entries are "<file stem>-<content hash>.json"; writing one removes the older entries of the
+# same stem. The stem rather than the full path is used because PyInstaller extracts to a new
+# directory on every launch.
+def cache_prefix(path): return os.path.splitext(os.path.basename(path))[0] + "-"
+
+def load_layout(path, cache_dir=None):
+    with open(path, "rb") as f: raw = f.read()
+    if cache_dir is None: cache_dir = user_cache_dir()
+    key = hashlib.sha256(raw + str(COMPILER_VERSION).encode()).hexdigest()
+    cache_path = os.path.join(cache_dir, cache_prefix(path) + key + ".json") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f: return from_cache(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError): pass
+    try: spec = json.loads(raw.decode("utf-8"))
+    except ValueError as e: raise LayoutError(f"{path}: {e}") from e
+    layout = compile_spec(spec)
+    if cache_path: write_cache(cache_path, layout)
+    return layout
+
+def write_cache(cache_path, layout):
+    tmp = None
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f: json.dump(to_cache(layout), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, cache_path)
+        directory, name = os.path.split(cache_path)
+        prefix = name[:name.rindex("-") + 1]
+        for old in os.listdir(directory):
+            if old.startswith(prefix) and len(old) == len(name) and old != name: os.remove(os.path.join(directory, old))
+    except OSError:
+        if tmp and os.path.exists(tmp): os.remove(tmp)
+
+if __name__ == "__main__":
+    failed = False
+    for path in sys.argv[1:]:
+        try:
+            layout = load_layout(path, cache_dir=False)
+            print(f"{path}: OK ({layout.name}, {layout.rows}x{layout.cols}, {SLOT_COUNT} phrases)")
+        except (OSError, LayoutError) as e:
+            print(f"{path}: {e}")
+            failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,194 @@
+import argparse
+import datetime
+import functools
+import io
+import os
+import struct
+from wordclock import (THEMES, COLS, DAYS_VN, BASE_GLYPHS, SLOTS, NORM_SIZE, MINI_SIZE, ANALOG_SIZE, HANDS,
+                       hand_table, grid_layout, render, cells)
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+# Window positions of the packed Tk widgets in the normal layout (see StudioClock.__init__): the greeting
+# band, then the word grid centered below it and the 280px right column with the analog face on top and
+# the date and digital labels at the bottom. Grids larger than the 6x10 one grow the image.
+GRID_X, GRID_TOP, RIGHT_GAP, RIGHT_W = 40, 84, 50, 280
+
+def normal_layout():
+    _, centers = grid_layout(False)
+    gw, gh = max(x for x, _ in centers) + centers[0][0], max(y for _, y in centers) + centers[0][1]
+    w, h = max(NORM_SIZE[0], 2 * GRID_X + gw + RIGHT_GAP + RIGHT_W), max(NORM_SIZE[1], 2 * GRID_TOP + gh)
+    rx = GRID_X + gw + RIGHT_GAP + RIGHT_W // 2
+    return {"size": (w, h), "grid": (GRID_X, GRID_TOP + (h - GRID_TOP - gh) // 2), "analog": (rx - ANALOG_SIZE // 2, GRID_TOP + 80),
+            "greeting": (w // 2, 62), "date": (rx, h - 134), "digital": (rx, h - 94)}
+
+NORMAL_LAYOUT = normal_layout()
+MINI_LAYOUT = {"size": MINI_SIZE, "grid": (0, 0)}
+FONT_FILES = ("courbd.ttf", "Courier New Bold.ttf", "LiberationMono-Bold.ttf", "DejaVuSans-Bold.ttf")
+
+@functools.lru_cache(maxsize=None)
+def load_font(points):
+    px = round(points * 96 / 72)
+    for name in FONT_FILES:
+        try: return ImageFont.truetype(name, px)
+        except OSError: pass
+    return ImageFont.load_default(px)
+
+class FrameRenderer:
+    def __init__(self, theme="Tiêu chuẩn", mini=False):
+        if Image is None: raise RuntimeError("Pillow is required for offscreen rendering (pip install pillow)")
+        self.t, self.mini = THEMES[theme], mini
+        self.layout = MINI_LAYOUT if mini else NORMAL_LAYOUT
+        self.size = self.layout["size"]
+        gx, gy = self.layout["grid"]
+        font_size, centers = grid_layout(mini)
+        self.grid_font = load_font(font_size)
+        self.centers = [(gx + x, gy + y) for x, y in centers]
+        self.cell = (centers[1][0] - centers[0][0], centers[COLS][1] - centers[0][1])
+        self.base = Image.new("RGB", self.size, self.t["bg"])
+        draw = ImageDraw.Draw(self.base)
+        for i, xy in enumerate(self.centers): draw.text(xy, BASE_GLYPHS[i], fill=self.t["grid_dim"], font=self.grid_font, anchor="mm")
+        if not mini: self.draw_face(draw)
+        self.slot, self.slot_image, self.tiles = None, None, {}
+
+    def draw_face(self, draw):
+        ax, ay = self.layout["analog"]
+        c = ANALOG_SIZE / 2; r = c - 10
+        draw.ellipse((ax+c-r, ay+c-r, ax+c+r, ay+c+r), outline=self.t["ui_dim"], width=2)
+        for x0, y0 in hand_table(ANALOG_SIZE, 12, 0):
+            dx, dy = (x0 - c) / r, (y0 - c) / r
+            draw.line((ax+c+(r-2)*dx, ay+c+(r-2)*dy, ax+c+(r-12)*dx, ay+c+(r-12)*dy), fill=self.t["ui_dim"], width=2)
+
+    def grid_image(self, slot):
+        if slot != self.slot:
+            mask, glyphs = SLOTS[slot]
+            self.slot, self.slot_image = slot, self.base.copy()
+            for i in cells(mask):
+                box, tile = self.lit_tile(i, glyphs.get(i, BASE_GLYPHS[i]))
+                self.slot_image.paste(tile, box)
+        return self.slot_image
+
+    def lit_tile(self, i, glyph):
+        if (i, glyph) not in self.tiles:
+            (x, y), (cw, ch) = self.centers[i], self.cell
+            box = (x - cw // 2, y - ch // 2, x - cw // 2 + cw, y - ch // 2 + ch)
+            tile = self.base.crop(box)
+            ImageDraw.Draw(tile).text((x - box[0], y - box[1]), glyph, fill=self.t["lit"], font=self.grid_font, anchor="mm")
+            self.tiles[i, glyph] = box[:2], tile
+        return self.tiles[i, glyph]
+
+    def render(self, now):
+        state = render(now)
+        im = self.grid_image(state.slot).copy()
+        if self.mini: return im
+        draw = ImageDraw.Draw(im)
+        ax, ay = self.layout["analog"]
+        c = ANALOG_SIZE / 2
+        h, m, s = now.hour, now.minute, now.second
+        for name, positions, inset, width, color in HANDS:
+            x, y = hand_table(ANALOG_SIZE, positions, inset)[{"hour": (h % 12) * 60 + m, "min": m * 60 + s, "sec": s}[name]]
+            draw.line((ax+c, ay+c, ax+x, ay+y), fill=self.t[color], width=width)
+        draw.text(self.layout["greeting"], state.greeting, fill=self.t["accent"], font=load_font(22), anchor="mm")
+        draw.text(self.layout["date"], f"{DAYS_VN[now.weekday()]}, {now.strftime('%d/%m/%Y')}", fill=self.t["lit"], font=load_font(16), anchor="mm")
+        draw.text(self.layout["digital"], now.strftime('%H:%M:%S'), fill=self.t["accent"], font=load_font(18), anchor="mm")
+        return im
+
+    def render_rgb(self, now): return self.render(now).tobytes()
+
+    def palette(self):
+        colors = [self.t["bg"]] + [v for k, v in self.t.items() if k != "bg"]
+        bg, rgb = Image.new("RGB", (1, 1), self.t["bg"]).getpixel((0, 0)), []
+        for color in colors[1:]:
+            target = Image.new("RGB", (1, 1), color).getpixel((0, 0))
+            rgb += [round(b + (t - b) * i / 50) for i in range(51) for b, t in zip(bg, target)]
+        pal = Image.new("P", (1, 1))
+        pal.putpalette((list(bg) + rgb)[:768])
+        return pal
+
+def day_timestamps(date, step=300):
+    start = datetime.datetime.combine(date, datetime.time(0))
+    for sec in range(0, 86400, step): yield start + datetime.timedelta(seconds=sec)
+
+class GifWriter:
+    def __init__(self, fp, size, delay=100, loop=0, palette=None):
+        self.fp, self.delay, self.palette, self.pending = fp, delay, palette, None
+        fp.write(b"GIF89a" + struct.pack("<HHBBB", size[0], size[1], 0x70, 0, 0))
+        fp.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00")
+
+    def frame_block(self, im):
+        im = im.quantize(palette=self.palette, dither=Image.Dither.NONE) if self.palette else im.quantize(256)
+        buf = io.BytesIO()
+        im.save(buf, "GIF")
+        data = buf.getvalue()
+        pos, table, bits = 13, b"", data[10] & 7
+        if data[10] & 0x80:
+            table = data[pos:pos + (3 << (bits + 1))]
+            pos += len(table)
+        while data[pos] == 0x21:
+            pos += 2
+            while data[pos]: pos += data[pos] + 1
+            pos += 1
+        desc = bytearray(data[pos:pos + 10])
+        if desc[9] & 0x80: table = b""
+        else: desc[9] |= 0x80 | bits
+        return bytes(desc) + table + data[pos + 10:-1]
+
+    def add(self, im, delay=None):
+        block, delay = self.frame_block(im), self.delay if delay is None else delay
+        if self.pending and self.pending[0] == block:
+            self.pending[1] += delay
+            return
+        self.write_pending()
+        self.pending = [block, delay]
+
+    def write_pending(self):
+        if not self.pending: return
+        block, delay = self.pending
+        # The frame delay is 16-bit centiseconds; longer static stretches repeat the frame for the rest.
+        cs = max(1, delay // 10)
+        while cs:
+            part = min(cs, 0xFFFF)
+            self.fp.write(b"\x21\xf9\x04\x04" + struct.pack("<H", part) + b"\x00\x00" + block)
+            cs -= part
+        self.pending = None
+
+    def close(self):
+        self.write_pending()
+        self.fp.write(b";")
+
+def export_png(renderer, timestamps, directory, prefix="frame"):
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    for count, now in enumerate(timestamps, 1): renderer.render(now).save(os.path.join(directory, f"{prefix}{count:05d}.png"))
+    return count
+
+def export_gif(renderer, timestamps, path, delay=100):
+    with open(path, "wb") as f:
+        writer = GifWriter(f, renderer.size, delay, palette=renderer.palette())
+        for now in timestamps: writer.add(renderer.render(now))
+        writer.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the word clock offscreen to PNG frames or an animated GIF.")
+    parser.add_argument("--theme", default="Tiêu chuẩn", help="theme name from THEMES, or 'all'")
+    parser.add_argument("--mini", action="store_true")
+    parser.add_argument("--date", type=datetime.date.fromisoformat, default=datetime.date.today())
+    parser.add_argument("--step", type=int, default=300, help="seconds between frames")
+    parser.add_argument("--delay", type=int, default=100, help="GIF frame delay in ms")
+    parser.add_argument("--format", choices=("gif", "png"), default="gif")
+    parser.add_argument("--out", default="export")
+    args = parser.parse_args(argv)
+    for theme in THEMES if args.theme == "all" else [args.theme]:
+        renderer = FrameRenderer(theme, args.mini)
+        name = f"{theme}{'-mini' if args.mini else ''}"
+        frames = day_timestamps(args.date, args.step)
+        if args.format == "png": export_png(renderer, frames, os.path.join(args.out, name))
+        else:
+            os.makedirs(args.out, exist_ok=True)
+            export_gif(renderer, frames, os.path.join(args.out, name + ".gif"), args.delay)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import json
+import os
+import stat
+import sys
+import threading
+from wordclock import THEMES, ROWS, COLS, BASE_GLYPHS, BLANK_SLOT, SLOTS, TRANSITIONS, WallClock, slot_of, cells
+
+# Newline-delimited JSON. A subscriber gets a "snapshot" on connect, then "delta" messages holding only
+# what changed: "on"/"off" cell masks (hex, bit r*cols+c) with the glyphs of the cells that light up or
+# change, "time" and "theme". A subscriber whose queue fills up is sent a fresh snapshot instead.
+QUEUE_SIZE = 32
+DEFAULT_ADDRESS = ("127.0.0.1", 8765)
+
+def encode(msg): return (json.dumps(msg, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+def parse_address(spec):
+    if not spec or spec == "1": return DEFAULT_ADDRESS
+    if "/" in spec or os.sep in spec:
+        if not hasattr(asyncio, "start_unix_server"): raise ValueError("UNIX sockets are not supported on this platform, use [host:]port")
+        return spec
+    host, _, port = spec.rpartition(":")
+    if not port.isdigit() or not 0 < int(port) < 65536: raise ValueError(f"invalid port {port!r}, expected [host:]port or a socket path")
+    return host or DEFAULT_ADDRESS[0], int(port)
+
+def remove_socket(path):
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode): os.remove(path)
+    except FileNotFoundError: pass
+
+class Subscriber:
+    def __init__(self, size):
+        self.task, self.queue, self.last = asyncio.current_task(), asyncio.Queue(size), -1
+        self.queue.put_nowait(None)
+
+    def push(self, seq, data):
+        if self.queue.full():
+            while not self.queue.empty(): self.queue.get_nowait()
+            self.queue.put_nowait(None)
+        else: self.queue.put_nowait((seq, data))
+
+class StateServer:
+    def __init__(self, address=DEFAULT_ADDRESS, queue_size=QUEUE_SIZE):
+        self.address, self.queue_size = address, queue_size
+        self.loop, self.server, self.subscribers = None, None, set()
+        self.seq, self.slot, self.clock, self.theme = 0, BLANK_SLOT, "", {}
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        if isinstance(self.address, str):
+            remove_socket(self.address)
+            self.server = await asyncio.start_unix_server(self.handle, self.address)
+        else: self.server = await asyncio.start_server(self.handle, *self.address)
+        return self.server
+
+    def start_thread(self):
+        ready, error = threading.Event(), []
+        def run():
+            loop = asyncio.new_event_loop()
+            try: loop.run_until_complete(self.start())
+            except OSError as e: return error.append(e)
+            finally: ready.set()
+            loop.run_forever()
+        threading.Thread(target=run, name="state-server", daemon=True).start()
+        ready.wait()
+        if error: raise error[0]
+
+    def stop(self, timeout=1):
+        if self.loop: asyncio.run_coroutine_threadsafe(self.close(), self.loop).result(timeout)
+
+    async def close(self):
+        self.server.close()
+        tasks = [sub.task for sub in self.subscribers]
+        for task in tasks: task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if isinstance(self.address, str): remove_socket(self.address)
+        self.loop.call_soon(self.loop.stop)
+
+    def snapshot(self):
+        mask, glyphs = SLOTS[self.slot]
+        return {"type": "snapshot", "seq": self.seq, "rows": ROWS, "cols": COLS, "base": "".join(BASE_GLYPHS),
+                "mask": f"{mask:x}", "glyphs": glyphs, "time": self.clock, "theme": self.theme}
+
+    def publish(self, now, theme=None):
+        msg, slot, clock = {}, slot_of(now.hour, now.minute), now.strftime("%H:%M:%S")
+        if slot != self.slot:
+            on, off, changed = TRANSITIONS[self.slot][slot]
+            glyphs = SLOTS[slot][1]
+            msg.update(on=f"{on:x}", off=f"{off:x}", glyphs={i: glyphs.get(i, BASE_GLYPHS[i]) for i in cells(on | changed)})
+            self.slot = slot
+        if clock != self.clock: msg["time"] = self.clock = clock
+        if theme is not None and theme != self.theme: msg["theme"] = self.theme = dict(theme)
+        if not msg: return
+        self.seq += 1
+        data = encode({"type": "delta", "seq": self.seq, **msg})
+        for sub in self.subscribers: sub.push(self.seq, data)
+
+    def publish_threadsafe(self, now, theme=None):
+        if self.loop: self.loop.call_soon_threadsafe(self.publish, now, theme)
+
+    async def handle(self, reader, writer):
+        sub = Subscriber(self.queue_size)
+        self.subscribers.add(sub)
+        try:
+            while True:
+                item = await sub.queue.get()
+                if item is None:
+                    sub.last = self.seq
+                    writer.write(encode(self.snapshot()))
+                elif item[0] > sub.last: writer.write(item[1])
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError): pass
+        finally:
+            self.subscribers.discard(sub)
+            writer.close()
+            try: await writer.wait_closed()
+            except ConnectionError: pass
+
+async def run_headless(server, source, theme):
+    await server.start()
+    while True:
+        now = source.now()
+        server.publish(now, theme)
+        await asyncio.sleep(source.delay_ms(now) / 1000)
+
+async def subscribe(address):
+    reader, writer = await (asyncio.open_unix_connection(address) if isinstance(address, str) else asyncio.open_connection(*address))
+    try:
+        while line := await reader.readline(): yield json.loads(line)
+    finally: writer.close()
+
+async def watch(address):
+    async for msg in subscribe(address): print(json.dumps(msg, ensure_ascii=False))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish the word clock state to local subscribers without a window.")
+    parser.add_argument("address", nargs="?", help="[host:]port or a UNIX socket path (default 127.0.0.1:8765)")
+    parser.add_argument("--theme", default="Tiêu chuẩn", choices=list(THEMES))
+    parser.add_argument("--offset", type=int, default=0, help="seconds added to the wall clock")
+    parser.add_argument("--watch", action="store_true", help="print the messages of a running server instead")
+    args = parser.parse_args(argv)
+    try:
+        address = parse_address(args.address)
+        asyncio.run(watch(address) if args.watch else run_headless(StateServer(address), WallClock(args.offset), THEMES[args.theme]))
+    except KeyboardInterrupt: pass
+    except (OSError, ValueError) as e: sys.exit(f"{args.address or 'state server'}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import datetime
+import heapq
+import json
+import os
+import sys
+import time
+from wordclock import LAYOUT, BLANK_SLOT, TRANSITIONS, render, slot_of
+
+# Transition log: a JSON header line, then one line per slot change:
+# "<ms since previous record> <slot> <on mask> <off mask> <changed mask>" with the masks in hex.
+LOG_VERSION = 1
+SIMULATION_DEFAULTS = {"speed": 600, "step": 1, "interval": 500, "start": "00:00", "stop": None, "record": None}
+
+# An ISO datetime, or HH:MM[:SS] on the day of `after` (today without it). A bare time that is not later
+# than `after` falls on the next day, so a stop before the start runs across midnight.
+def parse_time(text, after=None):
+    if text is None or isinstance(text, datetime.datetime): return text
+    if not isinstance(text, str): raise ValueError(f"invalid time {text!r}")
+    try: return datetime.datetime.fromisoformat(text)
+    except ValueError: pass
+    when = datetime.datetime.combine(after.date() if after else datetime.date.today(), datetime.time.fromisoformat(text))
+    return when + datetime.timedelta(days=1) if after and when <= after else when
+
+def sim_settings(section=None):
+    if section is not None and not isinstance(section, dict): raise ValueError(f"expected an object, got {section!r}")
+    sim = {**SIMULATION_DEFAULTS, **(section or {})}
+    sim["start"] = parse_time(sim["start"])
+    sim["stop"] = parse_time(sim["stop"], sim["start"])
+    return sim
+
+def timestamps(start, stop, step):
+    now, delta = start, datetime.timedelta(seconds=step)
+    while now < stop:
+        yield now
+        now += delta
+
+class Recorder:
+    def __init__(self, fp):
+        self.fp, self.slot, self.last, self.count = fp, BLANK_SLOT, None, 0
+
+    def feed(self, now, slot=None):
+        if slot is None: slot = slot_of(now.hour, now.minute)
+        if slot == self.slot: return
+        if self.last is None:
+            self.fp.write(json.dumps({"version": LOG_VERSION, "layout": LAYOUT.name, "start": now.isoformat()}, ensure_ascii=False) + "\n")
+            self.last = now
+        ms = round((now - self.last).total_seconds() * 1000)
+        on, off, changed = TRANSITIONS[self.slot][slot]
+        self.fp.write(f"{ms} {slot} {on:x} {off:x} {changed:x}\n")
+        self.slot, self.last, self.count = slot, self.last + datetime.timedelta(milliseconds=ms), self.count + 1
+
+    def close(self): self.fp.close()
+
+def parse_record(line):
+    ms, slot, on, off, changed = line.split()
+    ms, slot = int(ms), int(slot)
+    if ms < 0 or not 0 <= slot < BLANK_SLOT: raise ValueError("value out of range")
+    return ms, slot, int(on, 16), int(off, 16), int(changed, 16)
+
+# Malformed record lines are reported on stderr with their line number and skipped.
+def replay(fp):
+    header = json.loads(fp.readline() or "null")
+    if not isinstance(header, dict): raise ValueError("missing log header")
+    if header.get("version") != LOG_VERSION: raise ValueError(f"unsupported log version {header.get('version')}")
+    if not isinstance(header.get("layout"), str) or not isinstance(header.get("start"), str): raise ValueError("malformed log header")
+    start = datetime.datetime.fromisoformat(header["start"])
+    def records():
+        now = start
+        for n, line in enumerate(fp, 2):
+            if not line.strip(): continue
+            try: ms, *rec = parse_record(line)
+            except ValueError as e:
+                print(f"{getattr(fp, 'name', 'log')}:{n}: skipping malformed record {line.strip()!r} ({e})", file=sys.stderr)
+                continue
+            now += datetime.timedelta(milliseconds=ms)
+            yield now, *rec
+    return header, records()
+
+def run(start, stop, step, pipeline):
+    count, t0 = 0, time.perf_counter()
+    for now in timestamps(start, stop, step):
+        pipeline(now)
+        count += 1
+    return count, time.perf_counter() - t0
+
+# Cells animated by a transition: fades for cells turning on/off plus glyph swaps.
+def load_of(on, off, changed): return (on | off).bit_count() + changed.bit_count()
+
+def print_report(records, top=5):
+    busiest = heapq.nlargest(top, records, key=lambda r: load_of(*r[2:]))
+    for now, slot, *masks in busiest: print(f"  {now:%Y-%m-%d %H:%M:%S}  slot {slot:3}  {load_of(*masks):3} cells")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate the word clock faster than real time, record slot transitions and replay them.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run", help="drive the state pipeline as fast as possible")
+    p.add_argument("--start", default="00:00", help="ISO datetime or HH:MM[:SS] today")
+    p.add_argument("--stop", help="end time (default: one day after start)")
+    p.add_argument("--step", type=float, default=1, help="simulated seconds per step")
+    p.add_argument("--log", help="write the transition log here")
+    p = sub.add_parser("replay", help="replay a transition log and check it against the current layout")
+    p.add_argument("log")
+    p.add_argument("--speed", type=float, help="replay in simulated real time at this multiplier, printing each transition")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        try: start = parse_time(args.start)
+        except ValueError as e: parser.error(f"--start {args.start}: {e}")
+        try: stop = parse_time(args.stop, start) if args.stop else start + datetime.timedelta(days=1)
+        except ValueError as e: parser.error(f"--stop {args.stop}: {e}")
+        recorder = Recorder(open(args.log, "w", encoding="utf-8") if args.log else open(os.devnull, "w"))
+        records = []
+        def pipeline(now):
+            state = render(now)
+            if state.slot != recorder.slot:
+                records.append((now, state.slot) + TRANSITIONS[recorder.slot][state.slot])
+                recorder.feed(now, state.slot)
+        count, elapsed = run(start, stop, args.step, pipeline)
+        recorder.close()
+        print(f"{count} steps in {elapsed:.3f}s ({count / max(elapsed, 1e-9):.0f}/s), {recorder.count} transitions")
+        print("busiest transitions:")
+        print_report(records)
+        return
+
+    with open(args.log, "r", encoding="utf-8") as f:
+        try: header, records = replay(f)
+        except ValueError as e: sys.exit(f"{args.log}: {e}")
+        if header["layout"] != LAYOUT.name: print(f"warning: log recorded with layout {header['layout']!r}, current is {LAYOUT.name!r}")
+        seen, mismatches, prev, last = [], 0, BLANK_SLOT, None
+        for rec in records:
+            now, slot, on, off, changed = rec
+            if args.speed:
+                if last is not None: time.sleep((now - last).total_seconds() / args.speed)
+                print(f"{now:%Y-%m-%d %H:%M:%S}  slot {slot:3}  +{on.bit_count()} -{off.bit_count()} ~{changed.bit_count()}")
+            if TRANSITIONS[prev][slot] != (on, off, changed): mismatches += 1
+            seen.append(rec)
+            prev, last = slot, now
+    print(f"{len(seen)} transitions, {mismatches} differ from the current layout")
+    print("busiest transitions:")
+    print_report(seen)
+    if mismatches: sys.exit(1)
+
+if __name__ == "__main__":
+    main()
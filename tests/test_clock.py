@@ -0,0 +1,42 @@
+import datetime
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from test_layout import legacy_cells, minutes_of_day
+
+# StudioClock runs on bench.py's stub Tk. The stub replaces tkinter in sys.modules, so the app modules
+# are imported fresh inside a patched sys.modules that is restored afterwards.
+class StudioClockTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        for patch in (mock.patch.dict(os.environ, {"XDG_CACHE_HOME": tmp.name}), mock.patch.dict(sys.modules)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        for name in ("wordclock", "simulate", "server", "clock"): sys.modules.pop(name, None)
+        import bench
+        bench.install_stub_tk()
+        import clock
+        self.app = clock.StudioClock()
+        self.addCleanup(self.app.destroy)
+
+    def test_tick_matches_legacy_tick(self):
+        self.app.animator.enabled = False
+        base = datetime.datetime(2026, 1, 1)
+        for h, m in minutes_of_day():
+            self.app.tick(base.replace(hour=h, minute=m))
+            items = self.app.word_canvas.items
+            lit = {i: items[lid]["text"] for i, lid in self.app.text_ids.items() if items[lid].get("state") == "normal"}
+            self.assertEqual(lit, legacy_cells(h, m), f"{h:02d}:{m:02d}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import layout
+from layout import LayoutError, compile_spec, load_layout
+
+VI = os.path.join(ROOT, "layouts", "vi.json")
+
+# The word tables and phrase rules of the original hard-coded StudioClock.tick.
+LEGACY_GRID = ["bâymgiờtlà", "mườibảyhai", "chínămộtám", "sáubốnrgiờ", "kémrưỡihai", "nămườiílăm"]
+def legacy_range(r, c1, c2): return [(r, c) for c in range(c1, c2 + 1)]
+LEGACY_WORDS = {
+    "PREFIX": legacy_range(0, 0, 2) + legacy_range(0, 4, 6) + legacy_range(0, 8, 9),
+    "HOURS_1": legacy_range(2, 5, 7), "HOURS_2": legacy_range(1, 7, 9), "HOURS_3": legacy_range(1, 4, 5), "HOURS_4": legacy_range(3, 3, 5),
+    "HOURS_5": legacy_range(2, 3, 5), "HOURS_6": legacy_range(3, 0, 2), "HOURS_7": legacy_range(1, 4, 6), "HOURS_8": legacy_range(2, 7, 9),
+    "HOURS_9": legacy_range(2, 0, 3), "HOURS_10": legacy_range(1, 0, 3), "HOURS_11": legacy_range(1, 0, 3) + legacy_range(2, 5, 7),
+    "HOURS_12": legacy_range(1, 0, 3) + legacy_range(1, 7, 9), "GIO": legacy_range(3, 7, 9), "KEM": legacy_range(4, 0, 2),
+    "RUOI": legacy_range(4, 3, 6), "MIN_5": legacy_range(5, 0, 2), "MIN_10": legacy_range(5, 2, 5), "MIN_TY": legacy_range(5, 2, 5),
+    "MIN_LAM": legacy_range(5, 7, 9), "MIN_2": legacy_range(4, 7, 9),
+}
+LEGACY_MINUTES = {0: [], 5: ["MIN_5"], 10: ["MIN_10"], 15: ["MIN_10", "MIN_LAM"], 20: ["MIN_2", "MIN_TY"], 25: ["MIN_2", "MIN_TY", "MIN_LAM"], 30: ["RUOI"]}
+LEGACY_OVERRIDES = {"HOURS_3": {(1, 5): "a"}, "MIN_TY": {(5, 4): "ơ"}}
+
+def legacy_cells(h, m):
+    m_round = 5 * round(m / 5)
+    if m_round == 60: m_round = 0; h += 1
+    dh = h % 12 or 12
+    keys = ["PREFIX", f"HOURS_{dh}", "GIO"] + LEGACY_MINUTES[m_round] if m_round <= 30 else \
+           ["PREFIX", f"HOURS_{(dh % 12) + 1}", "GIO", "KEM"] + LEGACY_MINUTES[60 - m_round]
+    lit = {}
+    for k in keys:
+        for r, c in LEGACY_WORDS[k]: lit[r * 10 + c] = LEGACY_OVERRIDES.get(k, {}).get((r, c), LEGACY_GRID[r][c]).upper()
+    return lit
+
+def minutes_of_day(): return [(h, m) for h in range(24) for m in range(60)]
+
+def load_spec():
+    with open(VI, encoding="utf-8") as f: return json.load(f)
+
+def set_path(spec, path, value):
+    *parents, last = path
+    for key in parents: spec = spec[key]
+    spec[last] = value
+
+class ValidateTest(unittest.TestCase):
+    BAD = [
+        ("not an object", None, [1, 2]),
+        ("missing key", ("days",), None),
+        ("two-number range", ("words", "GIO"), [[3, 7]]),
+        ("string in range", ("words", "GIO"), [[3, "7", 9]]),
+        ("range outside grid", ("words", "GIO"), [[3, 7, 10]]),
+        ("empty greetings", ("greetings",), []),
+        ("malformed greeting", ("greetings",), [[24]]),
+        ("unsorted greetings", ("greetings",), [[24, "a"], [12, "b"]]),
+        ("string to_after", ("to_after",), "30"),
+        ("grid of empty rows", ("grid",), ["", ""]),
+        ("ragged grid", ("grid",), ["abc", "ab"]),
+        ("grid not strings", ("grid",), [[1, 2]]),
+        ("six days", ("days",), ["a"] * 6),
+        ("override off the word", ("overrides", "MIN_TY"), [[0, 0, "x"]]),
+        ("multi-char override", ("overrides", "MIN_TY"), [[5, 4, "ơơ"]]),
+        ("malformed override", ("overrides", "MIN_TY"), [[5, "ơ"]]),
+        ("unknown word", ("minutes", "5"), ["NOPE"]),
+        ("missing minute pattern", ("minutes",), {"0": []}),
+        ("overlapping words", ("minutes", "5"), ["MIN_5", "MIN_10"]),
+        ("minutes not lists", ("minutes", "5"), "MIN_5"),
+    ]
+
+    def test_bad_layouts_raise_layout_error(self):
+        for label, path, value in self.BAD:
+            with self.subTest(label):
+                spec = load_spec()
+                if path is None: spec = value
+                elif value is None: del spec[path[0]]
+                else: set_path(spec, path, value)
+                with self.assertRaises(LayoutError): compile_spec(spec)
+
+    def test_cli_reports_bad_layout_without_traceback(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bad.json")
+            spec = load_spec()
+            spec["words"]["GIO"] = [[3, 7]]
+            with open(path, "w", encoding="utf-8") as f: json.dump(spec, f)
+            run = subprocess.run([sys.executable, os.path.join(ROOT, "layout.py"), path, VI], capture_output=True, text=True, cwd=tmp)
+        self.assertEqual(run.returncode, 1)
+        self.assertNotIn("Traceback", run.stderr)
+        self.assertIn("bad.json: GIO", run.stdout)
+        self.assertIn("vi.json: OK", run.stdout)
+
+    def test_wide_grid(self):
+        spec = load_spec()
+        spec["grid"] += ["xxxxxxxxxx", "yyyyyyyyyy"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "wide.json")
+            with open(path, "w", encoding="utf-8") as f: json.dump(spec, f)
+            code = ("import wordclock, datetime; print(wordclock.ROWS * wordclock.COLS, wordclock.render(datetime.datetime(2026, 1, 1, 9, 0)).slot)\n"
+                    "try: import numpy\nexcept ImportError: raise SystemExit\n"
+                    "times = numpy.array(['2026-01-01T09:00'], dtype='datetime64[m]')\n"
+                    "assert list(wordclock.render_many(times)) == [wordclock.SLOTS[108][0]]")
+            run = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=tmp,
+                                 env={**os.environ, "CLOCK_LAYOUT": path, "PYTHONPATH": ROOT, "XDG_CACHE_HOME": tmp})
+        self.assertEqual(run.returncode, 0, run.stderr)
+        self.assertEqual(run.stdout.split(), ["80", "108"])
+
+class CacheTest(unittest.TestCase):
+    def test_cache_is_reused_and_pruned(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path, cache = os.path.join(tmp, "vi.json"), os.path.join(tmp, "cache")
+            spec = load_spec()
+            with open(path, "w", encoding="utf-8") as f: json.dump(spec, f)
+            first = load_layout(path, cache)
+            self.assertEqual(len(os.listdir(cache)), 1)
+            self.assertEqual(load_layout(path, cache).slots, first.slots)
+            spec["name"] = "changed"
+            with open(path, "w", encoding="utf-8") as f: json.dump(spec, f)
+            self.assertEqual(load_layout(path, cache).name, "changed")
+            self.assertEqual(len(os.listdir(cache)), 1)
+
+    def test_disabled_cache_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try: load_layout(VI, cache_dir=False)
+            finally: os.chdir(cwd)
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_default_cache_is_per_user(self):
+        self.assertTrue(os.path.isabs(layout.user_cache_dir()))
+
+class ParityTest(unittest.TestCase):
+    def test_slots_match_legacy_tick(self):
+        compiled = load_layout(VI, cache_dir=False)
+        for h, m in minutes_of_day():
+            mask, glyphs = compiled.slots[((h * 60 + m + 2) // 5) % layout.SLOT_COUNT]
+            lit = {i: glyphs.get(i, compiled.base[i]) for i in layout.cells(mask)}
+            self.assertEqual(lit, legacy_cells(h, m), f"{h:02d}:{m:02d}")
+
+if __name__ == "__main__":
+    unittest.main()
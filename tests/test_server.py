@@ -0,0 +1,79 @@
+import asyncio
+import datetime
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASE = datetime.datetime(2026, 1, 1, 8, 55)
+
+class StateServerTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for patch in (mock.patch.dict(os.environ, {"XDG_CACHE_HOME": tmp.name}), mock.patch.dict(sys.modules)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        for name in ("wordclock", "server"): sys.modules.pop(name, None)
+        import server, wordclock
+        self.wc = wordclock
+        self.server = server.StateServer(("127.0.0.1", 0), queue_size=4)
+        self.server.start_thread()
+        self.addCleanup(self.server.stop)
+        self.address = self.server.server.sockets[0].getsockname()[:2]
+
+    def publish_all(self, times):
+        self.server.loop.call_soon_threadsafe(lambda: [self.server.publish(now) for now in times])
+
+    def session(self, steps):
+        async def run():
+            reader, writer = await asyncio.open_connection(*self.address)
+            try:
+                msgs = []
+                for action in steps:
+                    if callable(action): action()
+                    else:
+                        for _ in range(action): msgs.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+                return msgs
+            finally: writer.close()
+        return asyncio.run(run())
+
+    def expected(self, slot):
+        mask, glyphs = self.wc.SLOTS[slot]
+        return mask, {i: glyphs.get(i, self.wc.BASE_GLYPHS[i]) for i in self.wc.cells(mask)}
+
+    def test_snapshot_then_deltas_reconstruct_the_grid(self):
+        times = [BASE + datetime.timedelta(minutes=m) for m in (0, 1, 3, 5, 10, 40)]
+        msgs = self.session([1] + [step for now in times for step in (lambda now=now: self.publish_all([now]), 1)])
+        snapshot, deltas = msgs[0], msgs[1:]
+        self.assertEqual(snapshot["type"], "snapshot")
+        self.assertEqual((snapshot["rows"], snapshot["cols"]), (self.wc.ROWS, self.wc.COLS))
+        base, mask = snapshot["base"], int(snapshot["mask"], 16)
+        lit = {int(i): glyph for i, glyph in snapshot["glyphs"].items()}
+        for now, delta in zip(times, deltas):
+            self.assertEqual(delta["type"], "delta")
+            self.assertEqual(delta["time"], now.strftime("%H:%M:%S"))
+            if "on" in delta:
+                mask = mask & ~int(delta["off"], 16) | int(delta["on"], 16)
+                lit.update({int(i): glyph for i, glyph in delta["glyphs"].items()})
+            self.assertEqual((mask, {i: lit.get(i, base[i]) for i in self.wc.cells(mask)}), self.expected(self.wc.slot_of(now.hour, now.minute)))
+        self.assertEqual([d["seq"] for d in deltas], list(range(1, len(times) + 1)))
+
+    def test_flooded_subscriber_resyncs_with_a_snapshot(self):
+        flood = [BASE + datetime.timedelta(seconds=s) for s in range(self.server.queue_size + 1)]
+        last = flood[-1] + datetime.timedelta(minutes=5)
+        msgs = self.session([1, lambda: self.publish_all(flood), 1, lambda: self.publish_all([last]), 1])
+        snapshot, delta = msgs[1:]
+        self.assertEqual(snapshot["type"], "snapshot")
+        self.assertEqual(snapshot["seq"], len(flood))
+        self.assertEqual(snapshot["time"], flood[-1].strftime("%H:%M:%S"))
+        self.assertEqual(int(snapshot["mask"], 16), self.expected(self.wc.slot_of(BASE.hour, BASE.minute))[0])
+        self.assertEqual((delta["type"], delta["seq"], delta["time"]), ("delta", len(flood) + 1, last.strftime("%H:%M:%S")))
+
+if __name__ == "__main__":
+    unittest.main()
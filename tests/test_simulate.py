@@ -0,0 +1,62 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+class RecordReplayTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.log = os.path.join(tmp.name, "day.log")
+        for patch in (mock.patch.dict(os.environ, {"XDG_CACHE_HOME": tmp.name}), mock.patch.dict(sys.modules)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        for name in ("wordclock", "simulate"): sys.modules.pop(name, None)
+        import simulate
+        self.simulate = simulate
+
+    def main(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try: self.simulate.main(list(argv))
+            except SystemExit as e: code = e.code
+            else: code = 0
+        return code, out.getvalue(), err.getvalue()
+
+    def record(self):
+        code, out, _ = self.main("run", "--start", "2026-01-01T22:00", "--stop", "02:00", "--step", "30", "--log", self.log)
+        self.assertEqual(code, 0)
+        self.assertIn("49 transitions", out)
+
+    def test_round_trip(self):
+        self.record()
+        code, out, err = self.main("replay", self.log)
+        self.assertEqual((code, err), (0, ""))
+        self.assertIn("49 transitions, 0 differ", out)
+
+    def test_malformed_line_is_reported_and_skipped(self):
+        self.record()
+        with open(self.log, encoding="utf-8") as f: lines = f.readlines()
+        lines[4] = "300000 12 zz\n"
+        with open(self.log, "w", encoding="utf-8") as f: f.writelines(lines)
+        code, out, err = self.main("replay", self.log)
+        self.assertIn(f"{self.log}:5: skipping malformed record", err)
+        self.assertIn("48 transitions", out)
+        self.assertEqual(code, 1)
+
+    def test_bad_times_are_reported(self):
+        code, _, err = self.main("run", "--start", "25:00")
+        self.assertEqual(code, 2)
+        self.assertIn("--start 25:00", err)
+        with self.assertRaises(ValueError): self.simulate.sim_settings({"start": 930})
+        sim = self.simulate.sim_settings({"start": "23:30", "stop": "00:30"})
+        self.assertEqual((sim["stop"] - sim["start"]).total_seconds(), 3600)
+
+if __name__ == "__main__":
+    unittest.main()
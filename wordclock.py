@@ -0,0 +1,132 @@
+import collections
+import datetime
+import functools
+import math
+import os
+import sys
+import time
+import zoneinfo
+from layout import SLOT_COUNT, load_layout, cells
+
+THEMES = {
+    "Tiêu chuẩn": {"bg": "#121212", "grid_dim": "#1f1f1f", "ui_dim": "#333333", "lit": "#ffffff", "accent": "#00d2ff", "sec": "#ff3b30"},
+    "Huyền bí":   {"bg": "#282a36", "grid_dim": "#343746", "ui_dim": "#44475a", "lit": "#f8f8f2", "accent": "#bd93f9", "sec": "#ff79c6"},
+    "Neon":       {"bg": "#0b0c15", "grid_dim": "#151726", "ui_dim": "#22263d", "lit": "#ff2a6d", "accent": "#05d9e8", "sec": "#d1f7ff"},
+    "Rừng xanh":  {"bg": "#021a0c", "grid_dim": "#052612", "ui_dim": "#0a4020", "lit": "#98fb98", "accent": "#00ff7f", "sec": "#ffffff"},
+    "Biển sâu":   {"bg": "#001e26", "grid_dim": "#012d38", "ui_dim": "#034d5e", "lit": "#e0f7fa", "accent": "#00bcd4", "sec": "#ff9800"},
+    "Tối giản":   {"bg": "#000000", "grid_dim": "#1a1a1a", "ui_dim": "#333333", "lit": "#eeeeee", "accent": "#ffffff", "sec": "#ffffff"},
+    "Chiều tà":   {"bg": "#2d1b2e", "grid_dim": "#3d243e", "ui_dim": "#5c3b3e", "lit": "#ffd700", "accent": "#ff6b6b", "sec": "#feca57"},
+    "Anh đào":    {"bg": "#2d142c", "grid_dim": "#3d1d3b", "ui_dim": "#5e2a5a", "lit": "#fff0f5", "accent": "#ff8fab", "sec": "#ffb3c1"},
+    "Sa mạc":     {"bg": "#2b1d0e", "grid_dim": "#3d2b18", "ui_dim": "#5e452a", "lit": "#fef5e7", "accent": "#edae49", "sec": "#d1495b"},
+    "Băng giá":   {"bg": "#0f172a", "grid_dim": "#1e293b", "ui_dim": "#334155", "lit": "#f1f5f9", "accent": "#38bdf8", "sec": "#94a3b8"},
+    "Cổ điển":    {"bg": "#2c2c2c", "grid_dim": "#3d3d3d", "ui_dim": "#4a4a4a", "lit": "#dcdcdc", "accent": "#c5a059", "sec": "#8b0000"},
+}
+
+DEFAULT_LAYOUT = os.path.join(getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__))), "layouts", "vi.json")
+LAYOUT = load_layout(os.environ.get("CLOCK_LAYOUT") or DEFAULT_LAYOUT)
+
+ROWS, COLS = LAYOUT.rows, LAYOUT.cols
+GRID_CHARS = LAYOUT.grid
+DAYS_VN = LAYOUT.days
+GREETINGS = LAYOUT.greetings
+BASE_GLYPHS = LAYOUT.base
+BLANK_SLOT = SLOT_COUNT
+
+def slot_of(h, m): return ((h * 60 + m + 2) // 5) % SLOT_COUNT
+
+# Milliseconds until the next slot (5-minute) and minute boundary, for ticks that only need those.
+def slot_delay_ms(now): return (300 - (now.minute + 2) % 5 * 60 - now.second) * 1000 - now.microsecond // 1000 + 5
+def minute_delay_ms(now): return (60 - now.second) * 1000 - now.microsecond // 1000 + 5
+
+# SLOTS[slot] = (mask of lit cells, {cell: glyph override}); slot 144 is the blank grid.
+SLOTS = LAYOUT.slots
+TRANSITIONS = LAYOUT.transitions
+
+class WallClock:
+    def __init__(self, offset=0): self.offset = offset
+    def now(self): return datetime.datetime.now() + datetime.timedelta(seconds=self.offset)
+    def resync(self): pass
+    def delay_ms(self, now): return 1000 - now.microsecond // 1000 + 5
+
+class MonotonicClock(WallClock):
+    def __init__(self, offset=0):
+        super().__init__(offset)
+        self.resync()
+    def resync(self): self.base, self.t0 = datetime.datetime.now(), time.monotonic()
+    def now(self): return self.base + datetime.timedelta(seconds=time.monotonic() - self.t0 + self.offset)
+
+# Runs `speed` times faster than real time from `start`, advancing in whole `step`s (seconds, 0 for
+# continuous) and wrapping back to `start` at `stop`; jump() moves to another time without a restart,
+# clamped into [start, stop).
+class SimulatedClock(WallClock):
+    def __init__(self, start, speed=600, interval=500, step=0, stop=None):
+        super().__init__()
+        self.origin, self.speed, self.interval, self.step, self.stop = start, speed, interval, step, stop
+        self.jump(start)
+    def jump(self, when):
+        if self.stop is not None and self.stop > self.origin: when = min(max(when, self.origin), self.stop - datetime.timedelta(seconds=1))
+        self.start, self.t0 = when, time.monotonic()
+    def now(self):
+        elapsed = (time.monotonic() - self.t0) * self.speed
+        if self.step: elapsed -= elapsed % self.step
+        pos = (self.start - self.origin).total_seconds() + elapsed
+        if self.stop is not None and self.stop > self.origin: pos %= (self.stop - self.origin).total_seconds()
+        return self.origin + datetime.timedelta(seconds=pos)
+    def delay_ms(self, now): return self.interval
+
+class ZoneClock(WallClock):
+    def __init__(self, tz=None, offset=0):
+        super().__init__(offset)
+        self.missing = None
+        try: self.tz = zoneinfo.ZoneInfo(tz) if tz else None
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError): self.tz, self.missing = None, tz
+    def now(self):
+        if self.tz is None: return super().now()
+        return datetime.datetime.now(self.tz).replace(tzinfo=None) + datetime.timedelta(seconds=self.offset)
+
+CLOCK_SOURCES = {"wall": WallClock, "monotonic": MonotonicClock}
+
+NORM_SIZE, MINI_SIZE = (960, 600), (450, 350)
+GRID_CANVAS = (COLS * 54, ROWS * 60)
+
+@functools.lru_cache(maxsize=None)
+def grid_layout(mini):
+    size, cw, ch = (18, 40, 45) if mini else (26, 54, 60)
+    off_x = (MINI_SIZE[0] - (COLS * cw)) // 2 if mini else 0
+    off_y = 50 if mini else 0
+    return size, tuple((off_x + (c * cw) + (cw // 2), off_y + (r * ch) + (ch // 2)) for r in range(ROWS) for c in range(COLS))
+
+ANALOG_SIZE = 240
+# name, positions per revolution, inset from the dial radius, width, theme color
+HANDS = (("hour", 720, 50, 4, "accent"), ("min", 3600, 30, 3, "accent"), ("sec", 60, 10, 1, "sec"))
+
+@functools.lru_cache(maxsize=None)
+def hand_table(size, positions, inset):
+    c = size / 2; l = c - 10 - inset
+    return tuple((c + l * math.cos(a), c + l * math.sin(a)) for a in (2 * math.pi * i / positions - math.pi / 2 for i in range(positions)))
+
+def greeting_for(h): return next(text for end, text in GREETINGS if h < end)
+
+State = collections.namedtuple("State", "slot mask glyphs greeting hour minute second")
+
+def render(now):
+    slot = slot_of(now.hour, now.minute)
+    return State(slot, SLOTS[slot][0], SLOTS[slot][1], greeting_for(now.hour), now.hour, now.minute, now.second)
+
+SLOT_MASKS = [mask for mask, _ in SLOTS[:BLANK_SLOT]]
+
+@functools.lru_cache(maxsize=None)
+def slot_masks_np():
+    import numpy as np
+    return np.array(SLOT_MASKS, dtype=np.uint64 if ROWS * COLS <= 64 else object)
+
+# Naive local timestamps: a datetime64 array is vectorised with NumPy and gives an array of
+# lit-cell masks (uint64, or Python ints for grids over 64 cells); any other sequence of
+# datetimes gives a list of int masks.
+# NumPy is only imported by callers that already pass an ndarray, so the GUI never loads it.
+def render_many(timestamps):
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(timestamps, np.ndarray):
+        mins = np.asarray(timestamps, dtype="datetime64[m]").astype(np.int64) % 1440
+        return slot_masks_np()[(mins + 2) // 5 % SLOT_COUNT]
+    return [SLOT_MASKS[slot_of(t.hour, t.minute)] for t in timestamps]